@@ -0,0 +1,282 @@
+"""
+Cost Katana OpenTelemetry: Client-Side Gateway Metrics (Python)
+
+Aggregate latency, cost and cache metrics from gateway response headers
+in-process and expose them as a Prometheus endpoint.
+
+Run: python 11-observability/python-sdk/gateway-metrics.py
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+GATEWAY_URL = "https://api.costkatana.com/api/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
+
+class LogHistogram:
+    """Histogram with log-spaced buckets (fixed relative error, O(1) record)"""
+
+    def __init__(self, min_value, max_value, buckets_per_doubling=4):
+        self.min_value = min_value
+        self.factor = 2 ** (1 / buckets_per_doubling)
+        self._log_factor = math.log(self.factor)
+        size = math.ceil(math.log(max_value / min_value) / self._log_factor) + 1
+        self.bounds = [min_value * self.factor ** i for i in range(size)]
+        self.counts = [0] * (size + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, value):
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = min(
+                math.ceil(math.log(value / self.min_value) / self._log_factor),
+                len(self.bounds),
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+
+def parse_duration_ms(value):
+    """Parse X-Request-Duration ("850ms", "1.2s" or "850") into milliseconds"""
+    if not value:
+        return None
+    value = value.strip().lower()
+    try:
+        if value.endswith("ms"):
+            return float(value[:-2])
+        if value.endswith("s"):
+            return float(value[:-1]) * 1000
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_float(value):
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GatewayMetrics:
+    """Per-model/provider/span histograms and counters fed from gateway responses"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._cost = {}
+        self._requests = {}
+        self._cache = {}
+        self._cost_total = {}
+        self._slowest = {}   # labels -> (duration_ms, trace_id) of the slowest traced request
+        self.started_at = time.time()
+
+    def record(self, model, provider, span_name, duration_ms=None, cost=None,
+               cache_status=None, status="success", trace_id=None):
+        labels = (model or "unknown", provider or "unknown", span_name or "request")
+        with self._lock:
+            key = labels + (status,)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if duration_ms is not None:
+                histogram = self._latency.get(labels)
+                if histogram is None:
+                    histogram = self._latency[labels] = LogHistogram(1, 600_000)
+                histogram.record(duration_ms)
+                if trace_id and duration_ms > self._slowest.get(labels, (-1.0, None))[0]:
+                    self._slowest[labels] = (duration_ms, trace_id)
+            if cost is not None:
+                histogram = self._cost.get(labels)
+                if histogram is None:
+                    histogram = self._cost[labels] = LogHistogram(1e-6, 100)
+                histogram.record(cost)
+                self._cost_total[labels] = self._cost_total.get(labels, 0.0) + cost
+            if cache_status:
+                key = labels + (cache_status.lower(),)
+                self._cache[key] = self._cache.get(key, 0) + 1
+
+    def record_response(self, response, model=None, provider=None, span_name=None):
+        """Record a gateway response from its X-* headers"""
+        headers = response.headers
+        request_headers = response.request.headers if response.request else {}
+        if model is None:
+            model = headers.get("X-Model") or _request_model(response.request)
+        self.record(
+            model=model,
+            provider=provider or headers.get("X-Provider"),
+            span_name=span_name or request_headers.get("X-Span-Name"),
+            duration_ms=parse_duration_ms(headers.get("X-Request-Duration")),
+            cost=parse_float(headers.get("X-Cost")),
+            cache_status=headers.get("X-Cache-Status"),
+            status="success" if response.ok else "error",
+            trace_id=headers.get("X-Trace-Id"),
+        )
+
+    def instrument(self, session):
+        """Attach a response hook so every gateway call on the session is recorded"""
+        session.hooks["response"].append(
+            lambda response, *args, **kwargs: self.record_response(response)
+        )
+        return session
+
+    def summary(self):
+        """p50/p95/p99 latency, cost/sec and the slowest request's trace per label set"""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            return {
+                labels: {
+                    "requests": histogram.count,
+                    "p50_ms": histogram.quantile(0.50),
+                    "p95_ms": histogram.quantile(0.95),
+                    "p99_ms": histogram.quantile(0.99),
+                    "cost_per_sec": self._cost_total.get(labels, 0.0) / elapsed,
+                    "slowest_trace_id": self._slowest.get(labels, (None, None))[1],
+                }
+                for labels, histogram in self._latency.items()
+            }
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            lines.append("# TYPE costkatana_client_requests_total counter")
+            for (model, provider, span, status), value in self._requests.items():
+                lines.append(
+                    f"costkatana_client_requests_total{{{_labels(model, provider, span)},"
+                    f'status="{_escape(status)}"}} {value}'
+                )
+            lines.append("# TYPE costkatana_client_cache_total counter")
+            for (model, provider, span, cache_status), value in self._cache.items():
+                lines.append(
+                    f"costkatana_client_cache_total{{{_labels(model, provider, span)},"
+                    f'cache_status="{_escape(cache_status)}"}} {value}'
+                )
+            lines.append("# TYPE costkatana_client_cost_usd_total counter")
+            for labels, value in self._cost_total.items():
+                lines.append(f"costkatana_client_cost_usd_total{{{_labels(*labels)}}} {value}")
+            _render_histograms(lines, "costkatana_client_request_duration_ms", self._latency)
+            _render_histograms(lines, "costkatana_client_request_cost_usd", self._cost)
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=METRICS_PORT):
+        """Serve /metrics from a background thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _request_model(request):
+    try:
+        return json.loads(request.body).get("model")
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _escape(value):
+    """Escape a label value as the Prometheus text format requires"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(model, provider, span):
+    return f'model="{_escape(model)}",provider="{_escape(provider)}",span="{_escape(span)}"'
+
+
+def _render_histograms(lines, name, histograms):
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in histograms.items():
+        label_text = _labels(*labels)
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{label_text},le="{bound:.6g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Cost Katana Client-Side Gateway Metrics (Python)\n")
+
+    metrics = GatewayMetrics()
+    session = metrics.instrument(requests.Session())
+    metrics.serve()
+    print(f"📡 Prometheus endpoint: http://localhost:{METRICS_PORT}/metrics\n")
+
+    try:
+        for model, span in [("gpt-4", "summarize"), ("gpt-3.5-turbo", "classify")] * 3:
+            response = session.post(
+                GATEWAY_URL,
+                json={
+                    "model": model,
+                    "messages": [{"role": "user", "content": "What is observability?"}]
+                },
+                headers={
+                    "Authorization": f"Bearer {API_KEY}",
+                    "X-Enable-Cache": "true",
+                    "X-Span-Name": span
+                }
+            )
+            response.raise_for_status()
+
+        print("✅ Latency and cost per label set:")
+        for (model, provider, span), stats in metrics.summary().items():
+            print(f"   {model} / {provider} / {span}")
+            print(f"      Requests: {stats['requests']}")
+            print(f"      p50 / p95 / p99: {stats['p50_ms']:.0f} / "
+                  f"{stats['p95_ms']:.0f} / {stats['p99_ms']:.0f} ms")
+            print(f"      Cost/sec: ${stats['cost_per_sec']:.6f}")
+            if stats["slowest_trace_id"]:
+                print(f"      Slowest trace: {stats['slowest_trace_id']}")
+
+        print("\n💡 Scrape the endpoint with Prometheus:")
+        print("   histogram_quantile(0.99, rate(costkatana_client_request_duration_ms_bucket[5m]))")
+        print("   rate(costkatana_client_cost_usd_total[5m])")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Cost Katana OpenTelemetry: Trace Tree & Critical Path Analysis (Python)
+
+Assemble session spans into a tree and report the critical path,
+self-time vs child-time and cost per subtree. Works on API results or
+locally exported span files (JSON / NDJSON) in near-linear time.
+
+Run: python 11-observability/python-sdk/trace-analyzer.py <session_id | spans.ndjson>
+     python 11-observability/python-sdk/trace-analyzer.py --benchmark
+"""
+
+import heapq
+import json
+import os
+import random
+import sys
+import time
+
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+
+class Span:
+    __slots__ = (
+        "span_id", "parent_id", "operation", "start", "duration", "cost",
+        "children", "child_time", "self_time", "subtree_cost", "subtree_spans",
+    )
+
+    def __init__(self, span_id, parent_id, operation, start, duration, cost):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.operation = operation
+        self.start = start
+        self.duration = duration
+        self.cost = cost
+        self.children = []
+        self.child_time = 0.0
+        self.self_time = duration
+        self.subtree_cost = cost
+        self.subtree_spans = 1
+
+    @property
+    def end(self):
+        return (self.start or 0.0) + self.duration
+
+
+def _number(value):
+    """Parse numbers that may arrive as strings such as "850ms" or "0.0021" """
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = str(value).strip().lower()
+    scale = 1.0
+    if value.endswith("ms"):
+        value = value[:-2]
+    elif value.endswith("s"):
+        value, scale = value[:-1], 1000.0
+    try:
+        return float(value) * scale
+    except ValueError:
+        return 0.0
+
+
+def _busy_time(children):
+    """Length of the union of the children's [start, end] intervals
+
+    Concurrent children (parallel calls) overlap, so summing their durations
+    would count the same wall-clock time more than once. Without timestamps
+    overlap can't be known and durations are summed.
+    """
+    if any(child.start is None for child in children):
+        return sum(child.duration for child in children)
+    busy = 0.0
+    current_start = current_end = None
+    for child in sorted(children, key=lambda c: c.start):
+        if current_end is None or child.start > current_end:
+            if current_end is not None:
+                busy += current_end - current_start
+            current_start, current_end = child.start, child.end
+        else:
+            current_end = max(current_end, child.end)
+    if current_end is not None:
+        busy += current_end - current_start
+    return busy
+
+
+def normalize_span(raw):
+    """Map API (`traceId`/`parentId`) and exported (`trace_id`/`parent_id`) shapes to a Span"""
+    span_id = raw.get("traceId") or raw.get("trace_id") or raw.get("spanId") or raw.get("span_id")
+    parent_id = (
+        raw.get("parentId") or raw.get("parent_id")
+        or raw.get("parentTraceId") or raw.get("parent_trace_id")
+    )
+    start = raw.get("startTime") or raw.get("start_time")
+    return Span(
+        span_id=span_id,
+        parent_id=parent_id,
+        operation=raw.get("operation") or raw.get("spanName") or raw.get("span_name") or "request",
+        start=_number(start) if start is not None else None,
+        duration=_number(raw.get("duration", raw.get("duration_ms"))),
+        cost=_number(raw.get("cost")),
+    )
+
+
+class TraceTree:
+    """Spans indexed by ID and parent, with per-subtree rollups"""
+
+    def __init__(self, raw_spans):
+        self.spans = {}
+        for raw in raw_spans:
+            span = normalize_span(raw)
+            if span.span_id:
+                self.spans[span.span_id] = span
+
+        self.roots = []
+        for span in self.spans.values():
+            parent = self.spans.get(span.parent_id) if span.parent_id else None
+            if parent is None or parent is span:
+                self.roots.append(span)
+            else:
+                parent.children.append(span)
+
+        self.cycles = self._break_cycles()
+        self._rollup()
+
+    def _reachable(self, roots):
+        seen = set()
+        stack = list(roots)
+        while stack:
+            span = stack.pop()
+            if id(span) not in seen:
+                seen.add(id(span))
+                stack.extend(span.children)
+        return seen
+
+    def _break_cycles(self):
+        """Promote one span per parent cycle to a root so no span or time is lost
+
+        A span unreachable from every root has a parent chain that loops back
+        on itself; the first span seen twice when walking up it is on the loop.
+        Returns the IDs of the promoted spans, including self-parented ones.
+        """
+        reached = self._reachable(self.roots)
+        promoted = [span.span_id for span in self.roots if span.parent_id == span.span_id]
+        for span in self.spans.values():
+            if id(span) in reached:
+                continue
+            on_path = set()
+            while id(span) not in on_path:
+                on_path.add(id(span))
+                span = self.spans[span.parent_id]
+            self.spans[span.parent_id].children.remove(span)
+            self.roots.append(span)
+            promoted.append(span.span_id)
+            reached |= self._reachable([span])
+        return promoted
+
+    def _rollup(self):
+        """Post-order pass without recursion so deep chains don't hit the stack limit"""
+        visited = set()
+        for root in self.roots:
+            stack = [(root, False)]
+            while stack:
+                span, expanded = stack.pop()
+                if expanded:
+                    for child in span.children:
+                        span.subtree_cost += child.subtree_cost
+                        span.subtree_spans += child.subtree_spans
+                    span.child_time = min(_busy_time(span.children), span.duration)
+                    span.self_time = span.duration - span.child_time
+                    continue
+                if id(span) in visited:
+                    continue
+                visited.add(id(span))
+                stack.append((span, True))
+                stack.extend((child, False) for child in span.children)
+
+    def critical_path(self):
+        """Follow the child that finishes last (or the longest one without timestamps)"""
+        if not self.roots:
+            return []
+        path = []
+        span = max(self.roots, key=lambda s: (s.end, s.duration))
+        seen = set()
+        while span is not None and id(span) not in seen:
+            seen.add(id(span))
+            path.append(span)
+            span = max(span.children, key=lambda s: (s.end, s.duration), default=None)
+        return path
+
+    def top_subtrees_by_cost(self, limit=5):
+        return heapq.nlargest(limit, self.spans.values(), key=lambda s: s.subtree_cost)
+
+    def total_cost(self):
+        return sum(root.subtree_cost for root in self.roots)
+
+    def print_tree(self, max_lines=40):
+        """Indented hierarchy (iterative, truncated for large sessions)"""
+        lines = 0
+        stack = [(root, 0) for root in reversed(self.roots)]
+        while stack and lines < max_lines:
+            span, depth = stack.pop()
+            print(f"   {'  ' * depth}└─ {span.operation} "
+                  f"[{span.duration:.0f}ms, self {span.self_time:.0f}ms, "
+                  f"subtree ${span.subtree_cost:.4f}]")
+            lines += 1
+            stack.extend((child, depth + 1) for child in reversed(span.children))
+        if len(self.spans) > lines:
+            print(f"   ... {len(self.spans) - lines} more spans")
+
+
+def load_spans_from_api(session_id):
+    """Fetch a session's spans from the API"""
+    response = requests.get(
+        f"{API_BASE}/v1/sessions/{session_id}",
+        headers={"Authorization": f"Bearer {API_KEY}"}
+    )
+    response.raise_for_status()
+    return response.json().get("traces", [])
+
+
+def load_spans_from_file(path):
+    """Load spans exported as NDJSON (one span per line) or a JSON array / session object"""
+    with open(path) as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data.get("traces", []) if isinstance(data, dict) else data
+
+
+def report(tree):
+    print("✅ Trace tree assembled:")
+    print(f"   Spans: {len(tree.spans):,}")
+    print(f"   Roots: {len(tree.roots):,}")
+    if tree.cycles:
+        print(f"   ⚠️  Parent cycles broken at {len(tree.cycles)} span(s), shown as roots: "
+              f"{', '.join(tree.cycles[:5])}")
+    print(f"   Total Cost: ${tree.total_cost():.4f}")
+
+    print("\n   Trace Hierarchy:")
+    tree.print_tree()
+
+    path = tree.critical_path()
+    print(f"\n🔥 Critical path ({len(path)} spans, "
+          f"{sum(span.self_time for span in path):.0f}ms self-time):")
+    for span in path[:20]:
+        print(f"   → {span.operation}: {span.duration:.0f}ms "
+              f"(self {span.self_time:.0f}ms, children {span.child_time:.0f}ms)")
+
+    print("\n💰 Most expensive subtrees:")
+    for span in tree.top_subtrees_by_cost():
+        print(f"   {span.operation} ({span.span_id}): ${span.subtree_cost:.4f} "
+              f"across {span.subtree_spans:,} spans")
+
+
+def benchmark(span_count=100_000):
+    """Build and analyze a synthetic session to check near-linear scaling"""
+    print(f"⏱️  Synthetic session with {span_count:,} spans...")
+    raw = [{"traceId": "span_0", "operation": "root", "duration": 60_000, "cost": 0}]
+    for i in range(1, span_count):
+        raw.append({
+            "traceId": f"span_{i}",
+            "parentId": f"span_{random.randrange(max(0, i - 50), i)}",
+            "operation": random.choice(["retrieve", "rerank", "generate", "tool_call"]),
+            "duration": random.uniform(5, 500),
+            "cost": random.uniform(0, 0.01),
+        })
+
+    start = time.perf_counter()
+    tree = TraceTree(raw)
+    built = time.perf_counter()
+    path = tree.critical_path()
+    tree.top_subtrees_by_cost()
+    done = time.perf_counter()
+
+    print(f"   Build + rollup: {(built - start) * 1000:.0f}ms")
+    print(f"   Critical path + top subtrees: {(done - built) * 1000:.0f}ms")
+    print(f"   Critical path length: {len(path)} spans")
+
+
+def main():
+    args = sys.argv[1:]
+
+    print("🥷 Cost Katana Trace Analyzer (Python)\n")
+
+    if args and args[0] == "--benchmark":
+        benchmark()
+        return
+
+    if args and os.path.exists(args[0]):
+        report(TraceTree(load_spans_from_file(args[0])))
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    if not args:
+        print("❌ Usage: trace-analyzer.py <session_id | spans.ndjson | --benchmark>")
+        return
+
+    try:
+        report(TraceTree(load_spans_from_api(args[0])))
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Cost Katana OpenTelemetry: Head & Tail Trace Sampling (Python)
+
+Sample traces at the rate set in the user telemetry config: deterministic
+head sampling by trace ID, plus tail sampling that always keeps traces
+with errors, high cost or high latency.
+
+Run: python 11-observability/python-sdk/trace-sampling.py
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+GATEWAY_URL = f"{API_BASE}/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+MAX_TRACE_ID = 2 ** 64
+
+
+class TelemetryConfigCache:
+    """Sampling config from /user-telemetry-config, refreshed in the background"""
+
+    def __init__(self, refresh_interval=60, default_rate=1.0):
+        self.refresh_interval = refresh_interval
+        self.enabled = True
+        self.rate = default_rate
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        response = requests.get(
+            f"{API_BASE}/user-telemetry-config",
+            headers={"Authorization": f"Bearer {API_KEY}"},
+            timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()["data"]
+        sampling = data.get("sampling", self.rate)
+        if isinstance(sampling, dict):
+            sampling = sampling.get("rate", self.rate)
+        # Plain attribute writes: readers never block on a refresh
+        self.rate = min(max(float(sampling), 0.0), 1.0)
+        self.enabled = bool(data.get("enabled", True))
+        return data
+
+    def start(self):
+        """Load once, then keep refreshing on a daemon thread"""
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except requests.exceptions.RequestException:
+                pass  # keep serving the last known config
+            except (KeyError, TypeError, ValueError) as e:
+                # Malformed payload (e.g. "sampling": null): keep the last good config
+                print(f"⚠️  Ignoring invalid telemetry config: {e!r}")
+
+
+class TraceSampler:
+    """Head sampling by trace ID with tail-based retention of interesting traces"""
+
+    def __init__(self, config, latency_threshold_ms=5000, cost_threshold=0.05,
+                 exporter=None, max_pending_traces=10_000):
+        self.config = config
+        self.latency_threshold_ms = latency_threshold_ms
+        self.cost_threshold = cost_threshold
+        self.exporter = exporter or (lambda trace_id, spans, reason: None)
+        self.max_pending_traces = max_pending_traces
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"head_kept": 0, "tail_kept": 0, "dropped": 0}
+
+    def head_sampled(self, trace_id):
+        """Same decision for a trace ID in every process and service
+
+        The ID is hashed first: uuid4-derived IDs (see distributed-trace.py)
+        have fixed version/variant bits, so raw ID bits are not uniform.
+        """
+        if not self.config.enabled:
+            return False
+        rate = self.config.rate
+        if rate >= 1.0:
+            return True
+        digest = hashlib.blake2b(trace_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") < rate * MAX_TRACE_ID
+
+    def span_headers(self, trace_id, span_name, session_id=None,
+                     parent_trace_id=None, attributes=None):
+        """Full span headers for sampled traces, minimal ones otherwise"""
+        sampled = self.head_sampled(trace_id)
+        headers = {
+            "traceparent": f"00-{trace_id}-{uuid.uuid4().hex[:16]}-{'01' if sampled else '00'}"
+        }
+        if session_id:
+            headers["X-Session-Id"] = session_id
+        if sampled:
+            headers["X-Span-Name"] = span_name
+            if parent_trace_id:
+                headers["X-Parent-Trace-Id"] = parent_trace_id
+            if attributes:
+                headers["X-Span-Attributes"] = json.dumps(attributes)
+        return headers
+
+    def record(self, trace_id, span_name, response=None, error=None):
+        """Buffer a finished span until the trace completes"""
+        span = {"span_name": span_name, "error": error is not None}
+        if response is not None:
+            span["status"] = response.status_code
+            span["error"] = span["error"] or not response.ok
+            span["trace_id"] = response.headers.get("X-Trace-Id")
+            span["duration_ms"] = _duration_ms(response.headers.get("X-Request-Duration"))
+            span["cost"] = _float(response.headers.get("X-Cost"))
+        with self._lock:
+            spans = self._pending.get(trace_id)
+            if spans is None:
+                spans = self._pending[trace_id] = []
+                if len(self._pending) > self.max_pending_traces:
+                    self._pending.popitem(last=False)
+                    self.stats["dropped"] += 1
+            spans.append(span)
+
+    def finish(self, trace_id):
+        """Decide whether to keep the trace; returns the reason or None"""
+        with self._lock:
+            spans = self._pending.pop(trace_id, [])
+        reason = None
+        if self.head_sampled(trace_id):
+            reason = "head"
+        elif any(span["error"] for span in spans):
+            reason = "error"
+        elif sum(span.get("cost") or 0 for span in spans) >= self.cost_threshold:
+            reason = "cost"
+        elif any((span.get("duration_ms") or 0) >= self.latency_threshold_ms for span in spans):
+            reason = "latency"
+
+        with self._lock:
+            if reason is None:
+                self.stats["dropped"] += 1
+            else:
+                self.stats["head_kept" if reason == "head" else "tail_kept"] += 1
+        if reason:
+            self.exporter(trace_id, spans, reason)
+        return reason
+
+
+def _float(value):
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _duration_ms(value):
+    """X-Request-Duration may be "850ms", "1.2s" or a bare millisecond count"""
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value.endswith("ms"):
+        return _float(value[:-2])
+    if value.endswith("s"):
+        seconds = _float(value[:-1])
+        return seconds * 1000 if seconds is not None else None
+    return _float(value)
+
+
+def sampled_pipeline(sampler, session_id):
+    """Two-step pipeline whose span headers follow the sampling decision"""
+
+    trace_id = uuid.uuid4().hex
+    parent = None
+    for span_name, model in [("entity_extraction", "gpt-4"), ("summarization", "gpt-3.5-turbo")]:
+        headers = sampler.span_headers(
+            trace_id, span_name,
+            session_id=session_id,
+            parent_trace_id=parent,
+            attributes={"pipeline": "demo"}
+        )
+        headers["Authorization"] = f"Bearer {API_KEY}"
+        try:
+            response = requests.post(
+                GATEWAY_URL,
+                json={"model": model, "messages": [{"role": "user", "content": "Process..."}]},
+                headers=headers
+            )
+            sampler.record(trace_id, span_name, response=response)
+            parent = response.headers.get("X-Trace-Id")
+        except requests.exceptions.RequestException as e:
+            sampler.record(trace_id, span_name, error=e)
+    return sampler.finish(trace_id)
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Cost Katana Head & Tail Trace Sampling (Python)\n")
+
+    try:
+        config = TelemetryConfigCache(refresh_interval=30).start()
+        print(f"1️⃣ Telemetry config: enabled={config.enabled}, sampling={config.rate}")
+
+        def exporter(trace_id, spans, reason):
+            print(f"   📤 Kept trace {trace_id[:8]}… ({reason}, {len(spans)} spans)")
+
+        sampler = TraceSampler(config, latency_threshold_ms=3000,
+                               cost_threshold=0.02, exporter=exporter)
+
+        print("\n2️⃣ Running sampled pipelines...")
+        session_id = f"sampled_{uuid.uuid4().hex[:8]}"
+        start = time.time()
+        for _ in range(5):
+            sampled_pipeline(sampler, session_id)
+
+        print(f"\n✅ Sampling summary ({time.time() - start:.1f}s):")
+        print(f"   Head-sampled: {sampler.stats['head_kept']}")
+        print(f"   Tail-kept (error/cost/latency): {sampler.stats['tail_kept']}")
+        print(f"   Dropped: {sampler.stats['dropped']}")
+        config.stop()
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
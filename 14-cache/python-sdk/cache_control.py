@@ -6,8 +6,12 @@ Clear, warmup, export, and import cache.
 Run: python 18-cache/python-sdk/cache_control.py
 """
 
+import contextlib
+import functools
 import os
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import List, Optional
 
 API_BASE = "https://api.costkatana.com/api"
@@ -73,6 +77,153 @@ def export_cache(format: str = "json"):
     
     return response.json()
 
+def export_cache_to_file(path: str, format: str = "ndjson", chunk_size: int = 1024 * 1024):
+    """Stream a cache export to disk in bounded memory, resuming a partial file
+
+    The export's ETag is kept next to the file; a resume sends it as
+    If-Range, so if the cache changed in between the server answers 200
+    with the full export and the file is rewritten instead of corrupted.
+    """
+    
+    etag_path = path + ".etag"
+    offset = os.path.getsize(path) if os.path.exists(path) else 0
+    etag = None
+    if offset and os.path.exists(etag_path):
+        with open(etag_path) as f:
+            etag = f.read().strip() or None
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    if offset and etag:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = etag
+    else:
+        offset = 0  # nothing to validate a resume against: start over
+    
+    with requests.get(
+        f"{API_BASE}/cache/export",
+        params={"format": format},
+        headers=headers,
+        stream=True
+    ) as response:
+        if response.status_code == 416:
+            print(f"✅ Cache export already complete ({offset:,} bytes)")
+            return offset
+        response.raise_for_status()
+        
+        if offset and response.status_code != 206:
+            offset = 0  # export changed (If-Range mismatch) or Range ignored: start over
+        if not offset:
+            # A rewritten file invalidates any import checkpoint taken from the old one
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(f"{path}.offset")
+            new_etag = response.headers.get("ETag")
+            if new_etag:
+                with open(etag_path, "w") as f:
+                    f.write(new_etag)
+            elif os.path.exists(etag_path):
+                os.remove(etag_path)
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length else None
+        
+        written = offset
+        next_report = written + 64 * 1024 * 1024
+        with open(path, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+                if written >= next_report:
+                    progress = f" ({written / total * 100:.1f}%)" if total else ""
+                    print(f"  ⬇️  {written / 1024 / 1024:,.0f} MB{progress}")
+                    next_report += 64 * 1024 * 1024
+    
+    print(f"✅ Cache exported to {path} ({written / 1024 / 1024:,.1f} MB, {format})")
+    return written
+
+def _read_batches(path: str, start: int, batch_size: int):
+    """Yield (start_offset, end_offset, [raw NDJSON lines]) without decoding JSON"""
+    
+    with open(path, "rb") as f:
+        f.seek(start)
+        batch, batch_start, position = [], start, start
+        for line in f:
+            position += len(line)
+            line = line.strip()
+            if line:
+                batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch_start, position, batch
+                batch, batch_start = [], position
+        if batch:
+            yield batch_start, position, batch
+
+def _import_batch(session: requests.Session, lines: List[bytes]):
+    """POST raw NDJSON lines as {"entries": [...]} without re-serializing them"""
+    
+    response = session.post(
+        f"{API_BASE}/cache/import",
+        data=b'{"entries":[' + b",".join(lines) + b"]}",
+        headers={
+            "Authorization": f"Bearer {API_KEY}",
+            "Content-Type": "application/json"
+        }
+    )
+    response.raise_for_status()
+    return response.json()["data"]
+
+def import_cache_from_file(path: str, batch_size: int = 1000, workers: int = 4):
+    """Restore an NDJSON export with parallel chunked imports, resumable via a .offset file"""
+    
+    checkpoint = f"{path}.offset"
+    committed = 0
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            committed = int(f.read().strip() or 0)
+    file_size = os.path.getsize(path)
+    
+    session = requests.Session()
+    totals = {"imported": 0, "failed": 0, "duplicates": 0}
+    done = {}  # batch start -> batch end, for batches finished out of order
+    lock = threading.Lock()
+    
+    def advance(start, end, data):
+        nonlocal committed
+        with lock:
+            for field in totals:
+                totals[field] += data.get(field, 0)
+            done[start] = end
+            # Only checkpoint the contiguous prefix so a resume never skips a batch
+            while committed in done:
+                committed = done.pop(committed)
+            with open(checkpoint, "w") as f:
+                f.write(str(committed))
+    
+    def on_done(future, start, end):
+        if future.exception() is None:
+            advance(start, end, future.result())
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for start, end, lines in _read_batches(path, committed, batch_size):
+            if len(in_flight) >= workers * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+            future = pool.submit(_import_batch, session, lines)
+            future.add_done_callback(functools.partial(on_done, start=start, end=end))
+            in_flight.add(future)
+        for future in in_flight:
+            future.result()
+    
+    print("✅ Cache import complete:")
+    print(f"  Imported: {totals['imported']:,}")
+    print(f"  Failed: {totals['failed']:,}")
+    print(f"  Duplicates: {totals['duplicates']:,}")
+    print(f"  Progress: {committed:,} / {file_size:,} bytes")
+    
+    if committed >= file_size:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(checkpoint)
+    return totals
+
 def main():
     if not API_KEY:
         print("❌ COST_KATANA_API_KEY required")
@@ -93,8 +244,15 @@ def main():
         print("\n2️⃣ Exporting cache...")
         export_cache()
         
-        # 3. Clear old entries
-        print("\n3️⃣ Clearing old entries...")
+        # 3. Stream a full export to disk and restore it
+        print("\n3️⃣ Streaming export to cache-export.ndjson...")
+        export_cache_to_file("cache-export.ndjson")
+        
+        print("\n4️⃣ Importing cache-export.ndjson...")
+        import_cache_from_file("cache-export.ndjson", batch_size=1000, workers=4)
+        
+        # 5. Clear old entries
+        print("\n5️⃣ Clearing old entries...")
         clear_cache(older_than=86400)
         
         print("\n✅ Cache control operations complete!")
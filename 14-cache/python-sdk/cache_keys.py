@@ -0,0 +1,179 @@
+"""
+Cost Katana Cache: Canonical Request Keys (Python)
+
+Normalize requests before hashing so trivially different requests share a
+cache entry: leading/trailing whitespace and line endings, parameter
+order, parameters spelled out at their defaults, SDK-only flags such as
+`cortex=True`, and model aliases. Every local cache layer in this folder keys on `canonical_key`.
+
+Run: python 14-cache/python-sdk/cache_keys.py [prompt-log.ndjson]
+"""
+
+import hashlib
+import json
+import sys
+
+# Aliases that resolve to the same model snapshot
+MODEL_ALIASES = {
+    "gpt-4-0613": "gpt-4",
+    "gpt-3.5-turbo-0125": "gpt-3.5-turbo",
+    "gpt-4o-2024-08-06": "gpt-4o",
+    "claude-3-5-sonnet-latest": "claude-3-5-sonnet-20241022",
+    "claude-3-5-sonnet": "claude-3-5-sonnet-20241022",
+    "claude-3-haiku": "claude-3-haiku-20240307",
+    "gemini-1.0-pro": "gemini-pro",
+}
+
+# Parameters that only change how the request is sent, not what is answered.
+# `cortex` rewrites the prompt in the gateway, so the original prompt is the key.
+TRANSPORT_PARAMS = frozenset({
+    "cache", "cortex", "retry", "max_retries", "failover", "timeout", "stream",
+    "project", "user_id", "tags", "metadata", "enable_cache", "cache_ttl", "headers",
+})
+
+DEFAULT_PARAMS = {
+    "temperature": 1.0,
+    "top_p": 1.0,
+    "n": 1,
+    "presence_penalty": 0.0,
+    "frequency_penalty": 0.0,
+    "stop": None,
+    "logit_bias": None,
+}
+
+def normalize_text(text):
+    # Interior whitespace is kept: indentation and newlines change code prompts
+    return text.replace("\r\n", "\n").strip()
+
+
+def canonical_model(model):
+    model = (model or "").strip().lower()
+    return MODEL_ALIASES.get(model, model)
+
+
+def _canonical_content(content):
+    if isinstance(content, str):
+        return normalize_text(content)
+    if isinstance(content, list):
+        return [
+            {**part, "text": normalize_text(part["text"])}
+            if isinstance(part, dict) and isinstance(part.get("text"), str) else part
+            for part in content
+        ]
+    return content
+
+
+def _canonical_value(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)  # 1 and 1.0 hash the same
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(item) for item in value] or None
+    if isinstance(value, dict):
+        return {key: _canonical_value(item) for key, item in value.items()} or None
+    return value
+
+
+def canonicalize(model, messages, params=None):
+    """Canonical form of a chat request; `messages` may be a plain prompt string"""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    canonical_params = {}
+    for key, value in (params or {}).items():
+        if key in TRANSPORT_PARAMS or key == "system_message":
+            continue
+        value = _canonical_value(value)
+        default = DEFAULT_PARAMS.get(key, ...)
+        if value is None or value == _canonical_value(default):
+            continue
+        canonical_params[key] = value
+    system_message = (params or {}).get("system_message")
+    if system_message:
+        messages = [{"role": "system", "content": system_message}, *messages]
+    return {
+        "model": canonical_model(model),
+        # Every field is kept (tool_calls, tool_call_id, name, ...); only text is normalized
+        "messages": [
+            {**message,
+             "role": message.get("role", "user").lower(),
+             "content": _canonical_content(message.get("content", ""))}
+            for message in messages
+        ],
+        "params": canonical_params,
+    }
+
+
+def canonical_key(model, messages, params=None):
+    """Fast 128-bit BLAKE2b digest of the canonical request"""
+    payload = json.dumps(
+        canonicalize(model, messages, params),
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _raw_key(model, messages, params=None):
+    """Key without canonicalization, for comparison"""
+    return json.dumps([model, messages, params or {}], sort_keys=False)
+
+
+def replay(records):
+    """Hit rate of an unbounded cache over a prompt log, raw vs canonical keys"""
+    raw_seen, canonical_seen = set(), set()
+    raw_hits = canonical_hits = total = 0
+    for record in records:
+        model = record.get("model")
+        messages = record.get("messages") or record.get("prompt", "")
+        params = record.get("params") or {}
+        raw, canonical = _raw_key(model, messages, params), canonical_key(model, messages, params)
+        raw_hits += raw in raw_seen
+        canonical_hits += canonical in canonical_seen
+        raw_seen.add(raw)
+        canonical_seen.add(canonical)
+        total += 1
+    return {
+        "requests": total,
+        "rawHitRate": raw_hits / total * 100 if total else 0.0,
+        "canonicalHitRate": canonical_hits / total * 100 if total else 0.0,
+        "rawKeys": len(raw_seen),
+        "canonicalKeys": len(canonical_seen),
+    }
+
+
+def _sample_log():
+    return [
+        {"model": "gpt-4", "prompt": "What is the capital of France?"},
+        {"model": "gpt-4", "prompt": "What is the capital of France? "},
+        {"model": "gpt-4-0613", "prompt": "What is the capital of France?\r\n"},
+        {"model": "gpt-4", "prompt": "What is the capital of France?",
+         "params": {"temperature": 1, "cortex": True}},
+        {"model": "gpt-4", "prompt": "Explain machine learning",
+         "params": {"max_tokens": 200, "temperature": 0.2}},
+        {"model": "gpt-4", "prompt": "Explain machine learning",
+         "params": {"temperature": 0.2, "max_tokens": 200, "top_p": 1.0}},
+        {"model": "claude-3-5-sonnet-latest", "prompt": "Summarize this:\n\nHello world"},
+        {"model": "claude-3-5-sonnet-20241022", "prompt": "Summarize this:\r\n\r\nHello world"},
+    ]
+
+
+def main():
+    print("🥷 Canonical Request Keys\n")
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        print(f"1️⃣ Replaying {sys.argv[1]}...")
+    else:
+        records = _sample_log()
+        print("1️⃣ Replaying built-in sample log...")
+
+    result = replay(records)
+    print(f"  Requests: {result['requests']:,}")
+    print(f"  Distinct keys (raw → canonical): {result['rawKeys']:,} → {result['canonicalKeys']:,}")
+    print(f"  Hit rate (raw): {result['rawHitRate']:.1f}%")
+    print(f"  Hit rate (canonical): {result['canonicalHitRate']:.1f}%")
+    print(f"  Uplift: +{result['canonicalHitRate'] - result['rawHitRate']:.1f} points")
+
+if __name__ == "__main__":
+    main()
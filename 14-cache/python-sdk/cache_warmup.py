@@ -0,0 +1,197 @@
+"""
+Cost Katana Cache: Chunked Cache Warmup Pipeline (Python)
+
+Normalize and dedupe prompts, skip ones that are already cached, and warm
+the rest in concurrent chunks with per-chunk retry and reporting.
+
+Run: python 14-cache/python-sdk/cache_warmup.py
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, List
+
+import requests
+
+from cache_keys import canonical_key, normalize_text
+
+API_BASE = "https://api.costkatana.com/api"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def prose_key(model: str, prompt: str) -> str:
+    """Cache key that ignores case and spacing
+
+    canonical_key keeps interior whitespace and case (they matter for code),
+    so warmup folds prose variants itself before keying.
+    """
+    return canonical_key(model, " ".join(prompt.split()).casefold())
+
+
+def dedupe_prompts(prompts: Iterable[str], model: str = "gpt-4") -> List[str]:
+    """Normalized prompts, first occurrence per prose_key wins"""
+    seen = set()
+    unique = []
+    for prompt in prompts:
+        prompt = normalize_text(prompt)
+        key = prose_key(model, prompt)
+        if prompt and key not in seen:
+            seen.add(key)
+            unique.append(prompt)
+    return unique
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+
+def filter_uncached(session, prompts, model, batch_size=1000):
+    """Bulk pre-check against /cache/check; keeps everything if the check is unavailable"""
+    uncached = []
+    for start in range(0, len(prompts), batch_size):
+        batch = prompts[start:start + batch_size]
+        try:
+            response = session.post(
+                f"{API_BASE}/cache/check",
+                json={"prompts": batch, "model": model},
+                headers=_headers(),
+                timeout=30
+            )
+            response.raise_for_status()
+            cached = response.json()["data"]["cached"]
+        except (requests.exceptions.RequestException, KeyError, TypeError, ValueError):
+            cached = []
+        if not isinstance(cached, list) or len(cached) != len(batch):
+            # A short or malformed answer proves nothing: warm whatever wasn't confirmed
+            cached = (cached if isinstance(cached, list) else [])[:len(batch)]
+            cached += [False] * (len(batch) - len(cached))
+        uncached.extend(prompt for prompt, hit in zip(batch, cached) if not hit)
+    return uncached
+
+
+def _retry_delay(response, attempt):
+    """Honor a numeric Retry-After, otherwise full-jitter exponential backoff"""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return random.uniform(0, 2 ** attempt)
+
+
+def warmup_chunk(session, index, prompts, model, ttl, max_retries=3):
+    """Warm one chunk, retrying transient failures with jittered backoff"""
+    result = {"chunk": index, "prompts": len(prompts), "cached": 0, "failed": len(prompts),
+              "totalCost": 0.0, "attempts": 0, "error": None, "items": prompts}
+    for attempt in range(max_retries + 1):
+        result["attempts"] = attempt + 1
+        try:
+            response = session.post(
+                f"{API_BASE}/cache/warmup",
+                json={"prompts": prompts, "model": model, "ttl": ttl},
+                headers=_headers(),
+                timeout=120
+            )
+            if response.status_code in RETRYABLE_STATUS and attempt < max_retries:
+                raise requests.exceptions.HTTPError(response=response)
+            response.raise_for_status()
+            data = response.json()["data"]
+            result.update(
+                cached=data["cached"], failed=data["failed"],
+                totalCost=data["totalCost"], error=None
+            )
+            return result
+        except (KeyError, TypeError) as e:
+            # 200 with an unexpected body: fail this chunk only, retrying won't help
+            result["error"] = f"unexpected response: {e!r}"
+            return result
+        except requests.exceptions.RequestException as e:
+            result["error"] = str(e) or type(e).__name__
+            status = getattr(e.response, "status_code", None)
+            if attempt == max_retries or (status is not None and status not in RETRYABLE_STATUS):
+                return result
+            time.sleep(_retry_delay(e.response, attempt))
+    return result
+
+
+def warmup_pipeline(prompts, model="gpt-4", ttl=86400, chunk_size=100,
+                    parallelism=4, max_retries=3, precheck=True, on_chunk=None):
+    """Dedupe → pre-check → concurrent chunked warmup; returns the summary"""
+    session = requests.Session()
+    started = time.time()
+
+    unique = dedupe_prompts(prompts, model)
+    pending = filter_uncached(session, unique, model) if precheck else unique
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    summary = {
+        "submitted": len(prompts),
+        "duplicates": len(prompts) - len(unique),
+        "alreadyCached": len(unique) - len(pending),
+        "chunks": len(chunks),
+        "cached": 0,
+        "failed": 0,
+        "totalCost": 0.0,
+        "failedChunks": [],
+    }
+
+    with ThreadPoolExecutor(max_workers=parallelism) as pool:
+        futures = [
+            pool.submit(warmup_chunk, session, i, chunk, model, ttl, max_retries)
+            for i, chunk in enumerate(chunks)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            summary["cached"] += result["cached"]
+            summary["failed"] += result["failed"]
+            summary["totalCost"] += result["totalCost"]
+            if result["error"]:
+                summary["failedChunks"].append(result["chunk"])
+            if on_chunk:
+                on_chunk(result)
+
+    summary["seconds"] = time.time() - started
+    return summary
+
+
+def print_chunk(result):
+    status = "✅" if not result["error"] else "❌"
+    print(f"  {status} Chunk {result['chunk']}: cached {result['cached']}/{result['prompts']}, "
+          f"failed {result['failed']}, ${result['totalCost']:.4f}, "
+          f"{result['attempts']} attempt(s)")
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Cache Warmup Pipeline\n")
+
+    prompts = [
+        "What is AI?",
+        "What is  AI? ",
+        "Explain machine learning",
+        "What is deep learning?",
+        "Explain   machine learning ",
+    ] + [f"Summarize FAQ entry #{i}" for i in range(500)]
+
+    summary = warmup_pipeline(prompts, chunk_size=50, parallelism=4, on_chunk=print_chunk)
+
+    print("\n✅ Cache warmup complete:")
+    print(f"  Submitted: {summary['submitted']}")
+    print(f"  Duplicates skipped: {summary['duplicates']}")
+    print(f"  Already cached: {summary['alreadyCached']}")
+    print(f"  Cached: {summary['cached']}")
+    print(f"  Failed: {summary['failed']} (chunks: {summary['failedChunks'] or 'none'})")
+    print(f"  Total Cost: ${summary['totalCost']:.4f}")
+    print(f"  Time: {summary['seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
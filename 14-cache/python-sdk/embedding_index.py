@@ -0,0 +1,253 @@
+"""
+Cost Katana Cache: Vectorized Embedding Index (Python)
+
+Check a whole batch of prompts against cached entries locally: normalized
+float32 vectors in one contiguous (optionally memory-mapped) matrix, top-k
+cosine similarity via one matrix multiply per query block, tombstoned
+deletes with periodic compaction.
+
+Requires: pip install numpy
+
+Run: python 14-cache/python-sdk/embedding_index.py
+     python 14-cache/python-sdk/embedding_index.py --benchmark 10000 1000000
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+EMBEDDINGS_URL = f"{API_BASE}/gateway/v1/embeddings"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+SCORE_BLOCK_BYTES = 256 * 1024 * 1024
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingIndex:
+    """Contiguous float32 matrix of unit vectors with tombstones
+
+    `path` backs the matrix with a new .npy memmap; an existing file is
+    never overwritten.
+    """
+
+    def __init__(self, dim, capacity=1024, path=None, compact_ratio=0.25):
+        if path and os.path.exists(path):
+            raise FileExistsError(f"{path} already exists; remove it or pick another path")
+        self.dim = dim
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.size = 0          # rows in use, including tombstones
+        self.tombstones = 0
+        self._keys = []        # row -> key
+        self._rows = {}        # key -> row
+        self._vectors = self._allocate(capacity)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+    def _allocate(self, capacity, path=None):
+        path = path or self.path
+        if path:
+            return np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+            )
+        return np.empty((capacity, self.dim), dtype=np.float32)
+
+    def _reserve(self, rows):
+        capacity = len(self._vectors)
+        if self.size + rows <= capacity:
+            return
+        while capacity < self.size + rows:
+            capacity *= 2
+        if self.path:
+            scratch = f"{self.path}.grow"
+            grown = self._allocate(capacity, scratch)
+            grown[:self.size] = self._vectors[:self.size]
+            grown.flush()
+            del grown
+            del self._vectors
+            os.replace(scratch, self.path)
+            self._vectors = np.load(self.path, mmap_mode="r+")
+        else:
+            grown = self._allocate(capacity)
+            grown[:self.size] = self._vectors[:self.size]
+            self._vectors = grown
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self._alive[:self.size]
+        self._alive = alive
+
+    def add(self, keys, vectors):
+        """Insert or replace vectors; replaced rows become tombstones"""
+        vectors = normalize(vectors)
+        if len(keys) != len(vectors):
+            raise ValueError("keys and vectors must have the same length")
+        last = {key: i for i, key in enumerate(keys)}   # repeated key in one batch: last wins
+        if len(last) < len(keys):
+            keep = sorted(last.values())
+            keys, vectors = [keys[i] for i in keep], vectors[keep]
+        self.delete([key for key in keys if key in self._rows], compact=False)
+        self._reserve(len(keys))
+        start, end = self.size, self.size + len(keys)
+        self._vectors[start:end] = vectors
+        self._alive[start:end] = True
+        for row, key in enumerate(keys, start):
+            self._rows[key] = row
+        self._keys.extend(keys)
+        self.size = end
+
+    def delete(self, keys, compact=True):
+        for key in keys:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._alive[row] = False
+                self.tombstones += 1
+        if compact and self.size and self.tombstones / self.size > self.compact_ratio:
+            self.compact()
+
+    def compact(self):
+        """Squeeze out tombstoned rows in place"""
+        rows = np.flatnonzero(self._alive[:self.size])
+        count = len(rows)
+        # rows[i] >= i, so copying forward in blocks never overwrites unread rows
+        for start in range(0, count, 65_536):
+            block = rows[start:start + 65_536]
+            self._vectors[start:start + len(block)] = self._vectors[block]
+        self._alive[:count] = True
+        self._alive[count:self.size] = False
+        self._keys = [self._keys[row] for row in rows]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self.size = count
+        self.tombstones = 0
+        if self.path:
+            self._vectors.flush()
+
+    def search(self, queries, k=1, threshold=None):
+        """Top-k cosine matches for every query: (keys[n][k], scores[n, k])"""
+        queries = normalize(queries)
+        k = min(k, len(self._rows))
+        if k == 0:
+            return [[] for _ in queries], np.empty((len(queries), 0), dtype=np.float32)
+
+        matrix = self._vectors[:self.size]
+        dead = np.flatnonzero(~self._alive[:self.size]) if self.tombstones else None
+        block = max(1, SCORE_BLOCK_BYTES // (4 * self.size))
+        top_rows = np.empty((len(queries), k), dtype=np.int64)
+        top_scores = np.empty((len(queries), k), dtype=np.float32)
+
+        for start in range(0, len(queries), block):
+            scores = queries[start:start + block] @ matrix.T
+            if dead is not None:
+                scores[:, dead] = -np.inf
+            if k == 1:
+                rows = scores.argmax(axis=1)[:, None]
+                top_rows[start:start + block] = rows
+                top_scores[start:start + block] = np.take_along_axis(scores, rows, axis=1)
+                continue
+            rows = np.argpartition(scores, -k, axis=1)[:, -k:]
+            picked = np.take_along_axis(scores, rows, axis=1)
+            order = np.argsort(-picked, axis=1)
+            top_rows[start:start + block] = np.take_along_axis(rows, order, axis=1)
+            top_scores[start:start + block] = np.take_along_axis(picked, order, axis=1)
+
+        keys = [
+            [self._keys[row] for row, score in zip(row_ids, scores)
+             if threshold is None or score >= threshold]
+            for row_ids, scores in zip(top_rows, top_scores)
+        ]
+        return keys, top_scores
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def embed(texts, model="text-embedding-3-small"):
+    """Embed a batch of texts through the gateway in one request"""
+    response = requests.post(
+        EMBEDDINGS_URL,
+        json={"model": model, "input": texts},
+        headers={"Authorization": f"Bearer {API_KEY}"}
+    )
+    response.raise_for_status()
+    return np.array([item["embedding"] for item in response.json()["data"]], dtype=np.float32)
+
+
+def benchmark(queries=10_000, entries=1_000_000, dim=384, k=5):
+    """Random unit vectors: time a full batch of top-k lookups"""
+    rng = np.random.default_rng(0)
+    index = EmbeddingIndex(dim, capacity=entries)
+    start = time.perf_counter()
+    for offset in range(0, entries, 100_000):
+        count = min(100_000, entries - offset)
+        index.add(list(range(offset, offset + count)),
+                  rng.standard_normal((count, dim), dtype=np.float32))
+    build = time.perf_counter() - start
+
+    index.delete(list(range(0, entries, 10)), compact=False)
+    batch = rng.standard_normal((queries, dim), dtype=np.float32)
+    start = time.perf_counter()
+    index.search(batch, k=k)
+    elapsed = time.perf_counter() - start
+
+    print(f"⏱️  {queries:,} queries x {entries:,} entries (dim={dim}, k={k}, 10% tombstoned)")
+    print(f"   Build: {build:.1f}s")
+    print(f"   Search: {elapsed:.2f}s ({queries / elapsed:,.0f} queries/s, "
+          f"{queries * entries / elapsed / 1e6:,.0f}M similarities/s)")
+
+    start = time.perf_counter()
+    index.compact()
+    print(f"   Compaction: {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    if "--benchmark" in sys.argv:
+        args = [int(arg) for arg in sys.argv[sys.argv.index("--benchmark") + 1:]]
+        benchmark(*args)
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Vectorized Embedding Index\n")
+
+    cached_prompts = [
+        "What are the benefits of cloud computing?",
+        "What is the capital of France?",
+        "Explain machine learning",
+    ]
+    incoming = [
+        "Tell me the advantages of using cloud services",
+        "Which city is France's capital?",
+        "How do I bake sourdough bread?",
+    ]
+
+    try:
+        print("1️⃣ Indexing cached prompts...")
+        vectors = embed(cached_prompts)
+        index = EmbeddingIndex(dim=vectors.shape[1])
+        index.add(cached_prompts, vectors)
+        print(f"   {len(index)} entries, dim={index.dim}")
+
+        print("\n2️⃣ Batch lookup (one embedding request, one matrix multiply)...")
+        keys, scores = index.search(embed(incoming), k=1, threshold=0.90)
+        for prompt, match, score in zip(incoming, keys, scores[:, 0]):
+            status = "hit" if match else "miss"
+            print(f"   {prompt}")
+            print(f"      Cache Status: {status}  Similarity Score: {score:.2f}")
+
+        print("\n✅ Batch semantic lookup complete!")
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Cost Katana Cache: Predictive Prewarming from Hot Keys (Python)
+
+Track how often each canonical request is seen in production with a
+Count-Min Sketch plus a top-K table, both in fixed memory, and re-warm
+the hottest prompts on a schedule shortly before their cache TTL runs
+out. No hand-written warmup lists.
+
+Run: python 14-cache/python-sdk/hot_keys.py
+     python 14-cache/python-sdk/hot_keys.py --simulate
+"""
+
+import hashlib
+import heapq
+import os
+import random
+import sys
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+import requests
+
+from cache_keys import canonical_key, canonical_model, normalize_text
+from cache_warmup import prose_key, warmup_pipeline
+from local_cache import CachedGateway
+
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+_MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """depth x width counters; estimates never undercount"""
+
+    def __init__(self, width=4096, depth=4):
+        self.width = width
+        self.depth = depth
+        self._rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _cells(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [((h1 + i * h2) & _MASK64) % self.width for i in range(self.depth)]
+
+    def add(self, key, count=1):
+        """Conservative update: only raise the counters that hold the minimum"""
+        cells = self._cells(key)
+        estimate = min(row[cell] for row, cell in zip(self._rows, cells)) + count
+        for row, cell in zip(self._rows, cells):
+            if row[cell] < estimate:
+                row[cell] = min(estimate, 0xFFFFFFFF)
+        return estimate
+
+    def estimate(self, key):
+        return min(row[cell] for row, cell in zip(self._rows, self._cells(key)))
+
+    def decay(self):
+        """Halve every counter so yesterday's traffic fades out"""
+        for i, row in enumerate(self._rows):
+            self._rows[i] = array("I", (value >> 1 for value in row))
+
+    @property
+    def nbytes(self):
+        return self.depth * self.width * self._rows[0].itemsize
+
+
+class HotKeys:
+    """Count-Min Sketch + top-K table of canonical request keys"""
+
+    def __init__(self, k=200, width=4096, depth=4, decay_every=100_000):
+        self.k = k
+        self.decay_every = decay_every
+        self.sketch = CountMinSketch(width, depth)
+        self.seen = 0
+        self._top = {}     # key -> {"count", "prompt", "model", "cachedAt", "ttl"}
+        self._heap = []    # (count, key) with stale entries skipped lazily
+        self._lock = threading.Lock()
+
+    def _min_entry(self):
+        while self._heap:
+            count, key = self._heap[0]
+            entry = self._top.get(key)
+            if entry is not None and entry["count"] == count:
+                return count, key
+            heapq.heappop(self._heap)
+        return None
+
+    def record(self, model, prompt, cached_at=None, ttl=None):
+        """Count one request; `cached_at` marks a fresh gateway cache entry"""
+        prompt = normalize_text(prompt)
+        model = canonical_model(model)
+        key = canonical_key(model, prompt)
+        with self._lock:
+            self.seen += 1
+            if self.seen % self.decay_every == 0:
+                self._decay()
+            count = self.sketch.add(key)
+
+            entry = self._top.get(key)
+            if entry is None:
+                if len(self._top) >= self.k:
+                    smallest = self._min_entry()
+                    if smallest is None or count <= smallest[0]:
+                        return count
+                    del self._top[smallest[1]]
+                entry = self._top[key] = {
+                    "count": count, "prompt": prompt, "model": model,
+                    "cachedAt": None, "ttl": None,
+                }
+            entry["count"] = count
+            if cached_at is not None:
+                entry["cachedAt"], entry["ttl"] = cached_at, ttl
+            heapq.heappush(self._heap, (count, key))
+            if len(self._heap) > 4 * self.k:
+                self._heap = [(e["count"], k) for k, e in self._top.items()]
+                heapq.heapify(self._heap)
+            return count
+
+    def _decay(self):
+        self.sketch.decay()
+        for entry in self._top.values():
+            entry["count"] >>= 1
+        self._heap = [(e["count"], k) for k, e in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def hottest(self, n=None):
+        with self._lock:
+            ranked = sorted(self._top.items(), key=lambda item: -item[1]["count"])
+            return [(key, dict(entry)) for key, entry in ranked[:n]]
+
+    def mark_warmed(self, keys, ttl, at=None):
+        at = time.time() if at is None else at
+        with self._lock:
+            for key in keys:
+                entry = self._top.get(key)
+                if entry is not None:
+                    entry["cachedAt"], entry["ttl"] = at, ttl
+
+
+class PredictivePrewarmer:
+    """Scheduled job that re-warms hot prompts shortly before their TTL expires"""
+
+    def __init__(self, hot_keys, ttl=3600, interval=60, lead_time=300,
+                 min_count=3, top_n=100, warmup=warmup_pipeline):
+        self.hot_keys = hot_keys
+        self.ttl = ttl
+        self.interval = interval
+        self.lead_time = lead_time
+        self.min_count = min_count
+        self.top_n = top_n
+        self.warmup = warmup
+        self._stop = threading.Event()
+        self.stats = {"runs": 0, "prewarmed": 0, "failed": 0, "totalCost": 0.0}
+
+    def due(self, now=None):
+        """Hot entries with no known cache entry, or one expiring within lead_time"""
+        now = time.time() if now is None else now
+        return [
+            (key, entry) for key, entry in self.hot_keys.hottest(self.top_n)
+            if entry["count"] >= self.min_count and (
+                entry["cachedAt"] is None
+                or entry["cachedAt"] + (entry["ttl"] or self.ttl) - self.lead_time <= now
+            )
+        ]
+
+    def run_once(self, now=None):
+        by_model = defaultdict(list)
+        for key, entry in self.due(now):
+            by_model[entry["model"]].append((key, entry["prompt"]))
+
+        for model, items in by_model.items():
+            keys = defaultdict(list)   # warmup dedupes by prose_key, so map chunks back by it
+            for key, prompt in items:
+                keys[prose_key(model, prompt)].append(key)
+
+            def mark_chunk(result, model=model, keys=keys):
+                # Mark per chunk, so one failed chunk doesn't re-warm (and re-pay for) the rest
+                if result["error"] is None and not result["failed"]:
+                    self.hot_keys.mark_warmed(
+                        [key for prompt in result["items"] for key in keys[prose_key(model, prompt)]],
+                        self.ttl,
+                    )
+
+            # The prompts are due precisely because they may still be cached,
+            # so skip the /cache/check pre-check and refresh them unconditionally.
+            summary = self.warmup([prompt for _, prompt in items], model=model,
+                                  ttl=self.ttl, precheck=False, on_chunk=mark_chunk)
+            self.stats["failed"] += summary["failed"]
+            self.stats["prewarmed"] += summary["cached"]
+            self.stats["totalCost"] += summary["totalCost"]
+        self.stats["runs"] += 1
+        return self.stats
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️  Prewarm run failed: {e}")
+
+    def start(self):
+        threading.Thread(target=self._loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+class TrackingGateway(CachedGateway):
+    """CachedGateway that feeds every single-prompt request into HotKeys"""
+
+    def __init__(self, hot_keys, cache=None, session=None):
+        super().__init__(cache=cache, session=session)
+        self.hot_keys = hot_keys
+
+    def chat(self, model, messages, enable_cache=True, cache_ttl=None, headers=None, **params):
+        data, info = super().chat(model, messages, enable_cache, cache_ttl, headers, **params)
+        # Warmup takes bare prompts, so only plain single-message requests are tracked
+        if enable_cache and not params and len(messages) == 1 and \
+                isinstance(messages[0].get("content"), str):
+            fresh = info["cache"] == "miss"
+            self.hot_keys.record(model, messages[0]["content"],
+                                 cached_at=time.time() if fresh else None,
+                                 ttl=cache_ttl if fresh else None)
+        return data, info
+
+
+def simulate(requests_count=100_000, distinct=20_000, ttl=600, k=200):
+    """Zipf-like traffic against a TTL cache, with and without predictive prewarming"""
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(distinct)]
+    stream = rng.choices(range(distinct), weights=weights, k=requests_count)
+    step = 0.05  # seconds of simulated time per request
+
+    def run(prewarm):
+        hot = HotKeys(k=k)
+        expires = {}
+        hits = 0
+        prewarmer = PredictivePrewarmer(
+            hot, ttl=ttl, lead_time=60, top_n=k,
+            warmup=lambda prompts, model, ttl, precheck, on_chunk: {
+                "cached": len(prompts), "failed": 0, "totalCost": 0.0, "failedChunks": []
+            },
+        )
+        next_run = 0.0
+        for i, item in enumerate(stream):
+            now = i * step
+            prompt = f"FAQ #{item}"
+            if prewarm and now >= next_run:
+                for key, entry in prewarmer.due(now):
+                    expires[entry["prompt"]] = now + ttl
+                    hot.mark_warmed([key], ttl, at=now)
+                next_run = now + 30
+            hit = expires.get(prompt, -1) > now
+            hits += hit
+            if not hit:
+                expires[prompt] = now + ttl
+            hot.record("gpt-4", prompt, cached_at=None if hit else now, ttl=ttl)
+        return hits / requests_count * 100
+
+    start = time.perf_counter()
+    baseline, prewarmed = run(False), run(True)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {requests_count:,} requests over {distinct:,} prompts, TTL {ttl}s, top-{k}")
+    print(f"   Hit rate without prewarming: {baseline:.1f}%")
+    print(f"   Hit rate with prewarming:    {prewarmed:.1f}%")
+    print(f"   Sketch memory: {HotKeys(k=k).sketch.nbytes / 1024:.0f} KB ({elapsed:.1f}s)")
+
+
+def main():
+    if "--simulate" in sys.argv:
+        simulate()
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Predictive Cache Prewarming\n")
+
+    hot = HotKeys(k=50)
+    gateway = TrackingGateway(hot)
+    traffic = (["What is the capital of France?"] * 5 + ["Explain machine learning"] * 3
+               + ["What is deep learning?"] * 2 + ["Write a haiku about rain"])
+
+    try:
+        print("1️⃣ Serving production traffic...")
+        for prompt in random.sample(traffic, len(traffic)):
+            _, info = gateway.chat("gpt-4", [{"role": "user", "content": prompt}], cache_ttl=600)
+            print(f"   {info['cache']:<5} {prompt}")
+
+        print("\n2️⃣ Hottest requests (Count-Min estimates):")
+        for _, entry in hot.hottest(5):
+            print(f"   {entry['count']:>3}x  {entry['prompt']}")
+
+        print("\n3️⃣ Prewarming hot prompts that expire within 15 minutes...")
+        prewarmer = PredictivePrewarmer(hot, ttl=600, lead_time=900, min_count=2)
+        stats = prewarmer.run_once()
+        print(f"   Prewarmed: {stats['prewarmed']}  Failed: {stats['failed']}  "
+              f"Cost: ${stats['totalCost']:.4f}")
+
+        print("\n✅ Schedule it with PredictivePrewarmer(hot, interval=60).start()")
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
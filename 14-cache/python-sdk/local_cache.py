@@ -0,0 +1,174 @@
+"""
+Cost Katana Cache: In-Process L1 Response Cache (Python)
+
+Serve repeat prompts from process memory in microseconds, in front of the
+gateway cache, with byte-bounded LRU/TTL eviction.
+
+Run: python 14-cache/python-sdk/local_cache.py
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from cache_keys import canonical_key
+
+API_BASE = "https://api.costkatana.com/api"
+GATEWAY_URL = f"{API_BASE}/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class LocalResponseCache:
+    """Thread-safe LRU bounded by total bytes, with per-entry TTL"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, default_ttl=3600):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.size_bytes = 0
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.size_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None, size=None):
+        size = (size if size is not None else len(value["body"])) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= old[1]
+            self._entries[key] = (expires_at, size, value)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedGateway:
+    """Gateway client that checks the L1 cache before going over the network"""
+
+    def __init__(self, cache=None, session=None):
+        self.cache = cache if cache is not None else LocalResponseCache()
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        self.stats = {
+            "local_hits": 0,
+            "gateway_hits": 0,
+            "misses": 0,
+            "local_cost_saved": 0.0,
+            "gateway_cost_saved": 0.0,
+        }
+
+    def chat(self, model, messages, enable_cache=True, cache_ttl=None, headers=None, **params):
+        """POST a chat completion; returns (data, info) where info["cache"] is local/hit/miss"""
+        key = canonical_key(model, messages, params) if enable_cache else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self._lock:
+                    self.stats["local_hits"] += 1
+                    self.stats["local_cost_saved"] += cached["cost"]
+                return json.loads(cached["body"]), {
+                    "cache": "local", "cost": 0.0, "cost_saved": cached["cost"]
+                }
+
+        request_headers = {
+            "Authorization": f"Bearer {API_KEY}",
+            "Content-Type": "application/json",
+            "X-Enable-Cache": "true" if enable_cache else "false",
+        }
+        if cache_ttl is not None:
+            request_headers["X-Cache-TTL"] = str(cache_ttl)
+        request_headers.update(headers or {})
+
+        response = self.session.post(
+            GATEWAY_URL,
+            json={"model": model, "messages": messages, **params},
+            headers=request_headers
+        )
+        response.raise_for_status()
+
+        status = (response.headers.get("X-Cache-Status") or "miss").lower()
+        cost = float(response.headers.get("X-Cost") or 0)
+        cost_saved = float(response.headers.get("X-Cost-Saved") or 0)
+        with self._lock:
+            self.stats["gateway_hits" if status == "hit" else "misses"] += 1
+            self.stats["gateway_cost_saved"] += cost_saved
+
+        if key is not None:
+            # A local hit saves whatever the original (uncached) call cost
+            try:
+                ttl = float(response.headers["X-Cache-TTL"])
+            except (KeyError, ValueError):
+                ttl = cache_ttl   # missing or malformed header: our TTL, else the cache default
+            self.cache.set(
+                key,
+                {"body": response.content, "cost": cost + cost_saved},
+                ttl=ttl,
+            )
+        return response.json(), {"cache": status, "cost": cost, "cost_saved": cost_saved}
+
+    def savings_report(self):
+        total = self.stats["local_hits"] + self.stats["gateway_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "total_requests": total,
+            "local_hit_rate": self.stats["local_hits"] / total * 100 if total else 0.0,
+            "total_cost_saved": self.stats["local_cost_saved"] + self.stats["gateway_cost_saved"],
+        }
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 In-Process L1 Response Cache\n")
+
+    gateway = CachedGateway(LocalResponseCache(max_bytes=16 * 1024 * 1024))
+    messages = [{"role": "user", "content": "What is the capital of France?"}]
+
+    try:
+        for attempt in range(1, 4):
+            start = time.perf_counter()
+            data, info = gateway.chat("gpt-4", messages, cache_ttl=3600)
+            elapsed_us = (time.perf_counter() - start) * 1_000_000
+            print(f"{attempt}️⃣ Cache: {info['cache']:<5}  Time: {elapsed_us:,.0f}µs  "
+                  f"Cost: ${info['cost']:.6f}  Saved: ${info['cost_saved']:.6f}")
+
+        report = gateway.savings_report()
+        print("\n📊 Savings (local + gateway):")
+        print(f"  Local hits: {report['local_hits']} ({report['local_hit_rate']:.1f}%)")
+        print(f"  Gateway hits: {report['gateway_hits']}")
+        print(f"  Local Cost Saved: ${report['local_cost_saved']:.6f}")
+        print(f"  Gateway Cost Saved (X-Cost-Saved): ${report['gateway_cost_saved']:.6f}")
+        print(f"  Total Cost Saved: ${report['total_cost_saved']:.6f}")
+        print(f"  L1 size: {len(gateway.cache)} entries, {gateway.cache.size_bytes:,} bytes")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Cost Katana Cache: Client-Side Rolling Cache Statistics (Python)
+
+`/cache/stats` reports lifetime totals. This collector builds recent
+numbers from response headers instead (X-Cache-Status, X-Cost-Saved,
+X-Tokens-Saved, X-Similarity-Score), kept in ring-buffer windows of
+1m/5m/1h per model and per route, so a hit-rate drop shows up in minutes.
+
+Run: python 14-cache/python-sdk/rolling_stats.py
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+GATEWAY_URL = f"{API_BASE}/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+# name -> (span seconds, slots); older slots are overwritten in place
+WINDOWS = {"1m": (60, 12), "5m": (300, 30), "1h": (3600, 60)}
+
+FIELDS = ("requests", "hits", "semanticHits", "costSaved", "tokensSaved",
+          "similaritySum", "similarityCount")
+
+
+class RingWindow:
+    """Fixed number of time slots; each slot holds one row of FIELDS counters"""
+
+    def __init__(self, span, slots):
+        self.width = span / slots
+        self.slots = slots
+        self._epochs = [-1] * slots
+        self._counts = [[0] * len(FIELDS) for _ in range(slots)]
+
+    def add(self, now, values):
+        epoch = int(now // self.width)
+        index = epoch % self.slots
+        row = self._counts[index]
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            row[:] = [0] * len(FIELDS)
+        for i, value in enumerate(values):
+            row[i] += value
+
+    def totals(self, now):
+        oldest = int(now // self.width) - self.slots + 1
+        totals = [0] * len(FIELDS)
+        for epoch, row in zip(self._epochs, self._counts):
+            if epoch >= oldest:
+                for i, value in enumerate(row):
+                    totals[i] += value
+        return dict(zip(FIELDS, totals))
+
+
+def _summarize(totals):
+    requests_count = totals["requests"]
+    similarity = totals.pop("similaritySum")
+    matched = totals.pop("similarityCount")
+    return {
+        **totals,
+        "misses": requests_count - totals["hits"],
+        "hitRate": totals["hits"] / requests_count * 100 if requests_count else 0.0,
+        "avgSimilarity": similarity / matched if matched else None,
+    }
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _request_model(request):
+    try:
+        return json.loads(request.body or b"{}").get("model")
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class CacheStatsCollector:
+    """Rolling cache statistics per model and per route, from gateway headers"""
+
+    def __init__(self, windows=WINDOWS, clock=time.time):
+        self.windows = windows
+        self.clock = clock
+        self._groups = {}  # (dimension, name) -> {window name: RingWindow}
+        self._lock = threading.Lock()
+
+    def _group(self, dimension, name):
+        group = self._groups.get((dimension, name))
+        if group is None:
+            group = self._groups[(dimension, name)] = {
+                window: RingWindow(span, slots) for window, (span, slots) in self.windows.items()
+            }
+        return group
+
+    def record(self, model, route, cache_status, cost_saved=None, tokens_saved=None,
+               similarity=None):
+        status = (cache_status or "miss").lower()
+        hit = status == "hit"
+        values = (
+            1, hit, hit and similarity is not None, cost_saved or 0.0, tokens_saved or 0,
+            similarity or 0.0, similarity is not None,
+        )
+        now = self.clock()
+        with self._lock:
+            for key in (("all", "*"), ("model", model or "unknown"), ("route", route or "/")):
+                for window in self._group(*key).values():
+                    window.add(now, values)
+
+    def record_response(self, response, model=None, route=None):
+        """Record a gateway response from its X-Cache-* headers"""
+        headers = response.headers
+        request = response.request
+        tokens_saved = _float(headers.get("X-Tokens-Saved"))
+        self.record(
+            model=model or headers.get("X-Model") or _request_model(request),
+            route=route or (urlparse(request.url).path if request is not None else None),
+            cache_status=headers.get("X-Cache-Status"),
+            cost_saved=_float(headers.get("X-Cost-Saved")),
+            tokens_saved=int(tokens_saved) if tokens_saved is not None else None,
+            similarity=_float(headers.get("X-Similarity-Score")),
+        )
+
+    def instrument(self, session):
+        """Attach a response hook so every call on the session is recorded"""
+        session.hooks["response"].append(
+            lambda response, *args, **kwargs: self.record_response(response)
+        )
+        return session
+
+    def snapshot(self, window="5m"):
+        """{"all": {...}, "model": {name: stats}, "route": {name: stats}} for one window"""
+        now = self.clock()
+        with self._lock:
+            groups = [(key, group[window].totals(now)) for key, group in self._groups.items()]
+        result = {"all": None, "model": {}, "route": {}}
+        for (dimension, name), totals in groups:
+            if not totals["requests"]:
+                continue
+            if dimension == "all":
+                result["all"] = _summarize(totals)
+            else:
+                result[dimension][name] = _summarize(totals)
+        return result
+
+    def regressions(self, window="5m", baseline="1h", drop=10.0, min_requests=20):
+        """Models/routes whose recent hit rate fell `drop` points below the baseline"""
+        recent, longer = self.snapshot(window), self.snapshot(baseline)
+        found = []
+        for dimension in ("model", "route"):
+            for name, stats in recent[dimension].items():
+                base = longer[dimension].get(name)
+                if base is None or stats["requests"] < min_requests:
+                    continue
+                if base["hitRate"] - stats["hitRate"] >= drop:
+                    found.append({
+                        "dimension": dimension, "name": name,
+                        "hitRate": stats["hitRate"], "baselineHitRate": base["hitRate"],
+                    })
+        return found
+
+
+def print_snapshot(collector, window):
+    snapshot = collector.snapshot(window)
+    overall = snapshot["all"]
+    print(f"\n📊 Last {window}:")
+    if overall is None:
+        print("  No requests")
+        return
+    print(f"  Hit Rate: {overall['hitRate']:.2f}% ({overall['hits']}/{overall['requests']})")
+    print(f"  Cost Saved: ${overall['costSaved']:.4f}  Tokens Saved: {overall['tokensSaved']:,}")
+    if overall["avgSimilarity"] is not None:
+        print(f"  Semantic hits: {overall['semanticHits']} "
+              f"(avg similarity {overall['avgSimilarity']:.2f})")
+    for dimension in ("model", "route"):
+        for name, stats in snapshot[dimension].items():
+            print(f"  {dimension} {name}: {stats['hitRate']:.1f}% of {stats['requests']}")
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Rolling Cache Statistics\n")
+
+    collector = CacheStatsCollector()
+    session = collector.instrument(requests.Session())
+    prompts = [
+        ("gpt-4", "What is the capital of France?"),
+        ("gpt-4", "What is the capital of France?"),
+        ("gpt-4", "Tell me France's capital city"),
+        ("gpt-3.5-turbo", "Explain machine learning"),
+        ("gpt-3.5-turbo", "Explain machine learning"),
+    ]
+
+    try:
+        for model, prompt in prompts:
+            response = session.post(
+                GATEWAY_URL,
+                json={"model": model, "messages": [{"role": "user", "content": prompt}]},
+                headers={
+                    "Authorization": f"Bearer {API_KEY}",
+                    "X-Enable-Cache": "true",
+                    "X-Cache-TTL": "3600"
+                }
+            )
+            response.raise_for_status()
+            print(f"  {model:<14} {response.headers.get('X-Cache-Status', 'miss'):<5} {prompt}")
+
+        for window in WINDOWS:
+            print_snapshot(collector, window)
+
+        regressions = collector.regressions(min_requests=1)
+        print(f"\n🚨 Hit-rate regressions (5m vs 1h): {regressions or 'none'}")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Cost Katana Cache: Local LSH Semantic Index (Python)
+
+Match paraphrased prompts locally with MinHash locality-sensitive hashing
+before going to the gateway. Lookups report a 0-1 score like
+`X-Similarity-Score`, but it is estimated word/phrase overlap (Jaccard),
+not embedding similarity, so local thresholds run lower than the
+gateway's `X-Semantic-Threshold` for the same paraphrases.
+
+MinHash estimates word/phrase overlap, so it catches rewordings that share
+vocabulary ("benefits of cloud computing" vs "cloud computing benefits").
+Pure synonym swaps still need the gateway's embedding match.
+
+The index lives in process memory and is sized for tens of thousands of
+prompts: 50k entries take about 10s to build, about 170MB RSS, and about
+150µs per lookup. Memory grows linearly (roughly 3KB per entry), so keep
+larger corpora at the gateway or in embedding_index.py.
+
+Run: python 14-cache/python-sdk/semantic_index.py
+     python 14-cache/python-sdk/semantic_index.py --benchmark 50000
+"""
+
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+from array import array
+
+import requests
+
+from cache_keys import canonical_key, canonical_model, normalize_text
+from local_cache import CachedGateway, LocalResponseCache
+
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from how i in is it me my of on or "
+    "please the this to was what when where which who why will with you your".split()
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text):
+    """Content words and adjacent word pairs, with naive plural folding"""
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") else w
+             for w in _WORD.findall(normalize_text(text).lower()) if w not in STOPWORDS]
+    features = set(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return features
+
+
+def _choose_bands(threshold, num_perm):
+    """Largest rows-per-band that still finds pairs at `threshold` with >= 99% probability"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= 0.99:
+            best = (bands, rows)
+    return best
+
+
+class SemanticIndex:
+    """MinHash signatures in one flat array plus banded LSH buckets"""
+
+    def __init__(self, threshold=0.90, num_perm=64, seed=b"costkatana"):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.seed = seed
+        self.bands, self.rows = _choose_bands(threshold, num_perm)
+        self._buckets = [dict() for _ in range(self.bands)]
+        self._signatures = array("I")
+        self._values = []
+        self._deleted = set()
+
+    def signature(self, text):
+        """One SHAKE-128 digest per feature supplies num_perm independent 32-bit
+        hashes; the signature is their element-wise minimum (computed in C via zip).
+        Returns None for text with no content words (e.g. "Who are you?"), since
+        all such prompts would otherwise share one signature"""
+        features = shingles(text)
+        if not features:
+            return None
+        size = self.num_perm * 4
+        rows = [
+            array("I", hashlib.shake_128(self.seed + feature.encode()).digest(size))
+            for feature in features
+        ]
+        return array("I", map(min, zip(*rows)))
+
+    def _band_keys(self, signature, scope):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, (scope, signature[band * rows:(band + 1) * rows].tobytes())
+
+    def add(self, text, value, scope=None):
+        """Index `text` (e.g. a cached prompt) and return its entry ID, or None
+        when it has no content words to match on"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        entry_id = len(self._values)
+        self._signatures.extend(signature)
+        self._values.append(value)
+        for band, key in self._band_keys(signature, scope):
+            self._buckets[band].setdefault(key, []).append(entry_id)
+        return entry_id
+
+    def remove(self, entry_id):
+        self._deleted.add(entry_id)
+        self._values[entry_id] = None
+
+    def lookup(self, text, scope=None, threshold=None):
+        """Best match as (value, similarity) or (None, best_score) below threshold"""
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(text)
+        if signature is None:
+            return None, 0.0
+        candidates = set()
+        for band, key in self._band_keys(signature, scope):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                candidates.update(bucket)
+        candidates -= self._deleted
+
+        best_id, best_score = None, 0.0
+        num_perm = self.num_perm
+        for entry_id in candidates:
+            offset = entry_id * num_perm
+            stored = self._signatures[offset:offset + num_perm]
+            score = sum(x == y for x, y in zip(signature, stored)) / num_perm
+            if score > best_score:
+                best_id, best_score = entry_id, score
+        if best_id is None or best_score < threshold:
+            return None, round(best_score, 2)
+        return self._values[best_id], round(best_score, 2)
+
+    def __len__(self):
+        return len(self._values) - len(self._deleted)
+
+
+def benchmark(entries=50_000, lookups=2_000):
+    """Build an index of synthetic prompts and time lookups"""
+    vocabulary = [f"term{i}" for i in range(20_000)]
+    rng = random.Random(1)
+    prompts = [" ".join(rng.choices(vocabulary, k=12)) for _ in range(entries)]
+
+    index = SemanticIndex(threshold=0.90)
+    start = time.perf_counter()
+    for i, prompt in enumerate(prompts):
+        index.add(prompt, i)
+    build = time.perf_counter() - start
+
+    queries = [rng.choice(prompts) for _ in range(lookups)]
+    start = time.perf_counter()
+    hits = sum(index.lookup(query)[0] is not None for query in queries)
+    per_lookup_us = (time.perf_counter() - start) / lookups * 1_000_000
+
+    print(f"⏱️  {entries:,} entries (bands={index.bands}, rows={index.rows})")
+    print(f"   Build: {build:.1f}s")
+    print(f"   Lookup: {per_lookup_us:.0f}µs avg ({hits}/{lookups} hits)")
+
+
+def main():
+    if "--benchmark" in sys.argv:
+        args = sys.argv[sys.argv.index("--benchmark") + 1:]
+        benchmark(int(args[0]) if args else 50_000)
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Local LSH Semantic Cache\n")
+
+    gateway = CachedGateway(LocalResponseCache())
+    # Jaccard overlap, not embedding cosine: 0.65 here vs 0.90 at the gateway below
+    index = SemanticIndex(threshold=0.65)
+
+    def ask(prompt):
+        messages = [{"role": "user", "content": prompt}]
+        match, score = index.lookup(prompt, scope=canonical_model("gpt-4"))
+        if match is not None:
+            cached = gateway.cache.get(match)
+            if cached is not None:
+                print("  Cache Status: local-semantic")
+                print(f"  Similarity Score: {score:.2f}")
+                print(f"  Cost Saved: ${cached['cost']:.6f}")
+                return
+        _, info = gateway.chat("gpt-4", messages, headers={"X-Semantic-Threshold": "0.90"})
+        index.add(prompt, canonical_key("gpt-4", messages), scope=canonical_model("gpt-4"))
+        print(f"  Cache Status: {info['cache']} (best local score {score:.2f})")
+
+    try:
+        print("1️⃣ Original query...")
+        ask("What are the benefits of cloud computing?")
+        print("\n2️⃣ Reworded query...")
+        ask("What are the main benefits of cloud computing?")
+        print("\n✅ Local semantic lookup complete!")
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Cost Katana Cache: Disk-Backed Shared Response Cache (Python)
+
+A persistent SQLite (WAL) cache backend shared by every worker process on
+a host. It survives restarts, evicts by TTL and size in the background and
+reports hit rate per process and in total. Drop-in backend for
+CachedGateway from local_cache.py.
+
+Run: python 14-cache/python-sdk/shared_cache.py
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from multiprocessing import Pool
+
+import requests
+
+from local_cache import CachedGateway
+
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+CACHE_PATH = os.getenv("COST_KATANA_CACHE_PATH", "costkatana-cache.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    cost REAL NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS process_stats (
+    pid INTEGER PRIMARY KEY,
+    hits INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SharedResponseCache:
+    """SQLite WAL cache safe to share between pre-forked workers
+
+    Reads never take the write lock; access times and hit counters are
+    buffered in memory and flushed by a per-process background thread,
+    which also runs TTL and size eviction.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=1024 * 1024 * 1024,
+                 default_ttl=3600, maintenance_interval=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.maintenance_interval = maintenance_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset_process_state()
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _reset_process_state(self):
+        """Counters and the maintenance thread belong to one process; re-create after fork"""
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self._flushed = (0, 0)   # hits, misses already added to process_stats
+        self._touched = {}
+        self._stop = threading.Event()
+        threading.Thread(target=self._maintain, daemon=True).start()
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset_process_state()
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                 check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def get(self, key):
+        db = self._connect()
+        row = db.execute(
+            "SELECT body, cost, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        with self._lock:
+            if row is None or row[2] < now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+        return {"body": row[0], "cost": row[1]}
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        body = value["body"]
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (key, body, cost, size, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, body, value.get("cost", 0.0), len(body),
+             now + (ttl if ttl is not None else self.default_ttl), now)
+        )
+
+    def flush(self):
+        """Write buffered access times and add this process's new hits and misses
+
+        Counters are added, not replaced, so a restarted worker that reuses a
+        PID keeps adding to the same row instead of wiping it.
+        """
+        db = self._connect()
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            hits, misses = self.hits, self.misses
+        new_hits, new_misses = hits - self._flushed[0], misses - self._flushed[1]
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ?",
+                [(at, key) for key, at in touched.items()]
+            )
+            if new_hits or new_misses:
+                db.execute(
+                    "INSERT INTO process_stats (pid, hits, misses, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (pid) DO UPDATE SET hits = hits + excluded.hits, "
+                    "misses = misses + excluded.misses, updated_at = excluded.updated_at",
+                    (os.getpid(), new_hits, new_misses, time.time())
+                )
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            db.execute("ROLLBACK")
+            raise
+        self._flushed = (hits, misses)
+
+    def evict(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes"""
+        db = self._connect()
+        db.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = db.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 500"
+            ).fetchall()
+            if not oldest:
+                break
+            victims = []
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                victims.append((key,))
+                total -= size
+            db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def _maintain(self):
+        stop = self._stop
+        while not stop.wait(self.maintenance_interval):
+            try:
+                self.flush()
+                self.evict()
+            except sqlite3.Error as e:
+                print(f"⚠️  Cache maintenance failed: {e}")
+
+    def stats(self):
+        """Hit rate for every process that has used the cache, plus the total"""
+        self.flush()
+        return read_stats(self.path)
+
+
+def read_stats(path=CACHE_PATH):
+    """Stats from the cache file alone; no flusher thread, no stats row of its own"""
+    db = sqlite3.connect(path, timeout=30)
+    try:
+        rows = db.execute(
+            "SELECT pid, hits, misses FROM process_stats ORDER BY pid"
+        ).fetchall()
+        entries, size = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+    finally:
+        db.close()
+    per_process = {
+        pid: {"hits": hits, "misses": misses,
+              "hitRate": hits / (hits + misses) * 100 if hits + misses else 0.0}
+        for pid, hits, misses in rows
+    }
+    hits = sum(row[1] for row in rows)
+    total = hits + sum(row[2] for row in rows)
+    return {
+        "processes": per_process,
+        "hits": hits,
+        "requests": total,
+        "hitRate": hits / total * 100 if total else 0.0,
+        "entries": entries,
+        "bytes": size,
+    }
+
+
+_gateway = None
+
+
+def ai(model, prompt, cache=True, **params):
+    """ck.ai-style call backed by the shared on-disk cache"""
+    global _gateway
+    if _gateway is None:
+        _gateway = CachedGateway(cache=SharedResponseCache())
+    data, info = _gateway.chat(model, [{"role": "user", "content": prompt}],
+                               enable_cache=cache, **params)
+    return {
+        "text": data["choices"][0]["message"]["content"],
+        "cost": info["cost"],
+        "cached": info["cache"] != "miss",
+    }
+
+
+def worker(prompt):
+    response = ai("gpt-4", prompt, cache=True)
+    _gateway.cache.flush()   # publish counters now; the pool may stop this worker any time
+    return os.getpid(), response["cached"]
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Disk-Backed Shared Response Cache\n")
+
+    prompts = [
+        "What is the capital of France?",
+        "Explain machine learning",
+        "What is deep learning?",
+    ] * 8
+
+    try:
+        print(f"1️⃣ 4 worker processes sharing {CACHE_PATH}...")
+        with Pool(processes=4) as pool:
+            results = pool.map(worker, prompts, chunksize=2)
+        print(f"   {sum(cached for _, cached in results)}/{len(results)} answers came from cache")
+
+        stats = read_stats(CACHE_PATH)
+        print("\n📊 Shared cache statistics:")
+        for pid, process in stats["processes"].items():
+            print(f"  PID {pid}: {process['hits']} hits / {process['misses']} misses "
+                  f"({process['hitRate']:.1f}%)")
+        print(f"  Total Hit Rate: {stats['hitRate']:.2f}%")
+        print(f"  Entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KB)")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Cost Katana Cache: Single-Flight Request Coalescing (Python)
+
+When many handlers ask the same question at once, only the first (the
+leader) goes to the gateway; the rest wait for its result instead of
+paying for their own call. Works for threaded and asyncio callers, keyed
+on the canonical request from cache_keys.py.
+
+Run: python 14-cache/python-sdk/single_flight.py
+"""
+
+import asyncio
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from cache_keys import canonical_key
+from local_cache import CachedGateway
+
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_LEADER_CANCELLED = object()
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution
+
+    Followers get the leader's result or exception. A follower that waits
+    longer than `timeout` seconds stops waiting and makes its own call.
+    """
+
+    def __init__(self, timeout=30.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}        # key -> _Call (threads)
+        self._futures = {}      # (loop, key) -> asyncio.Future
+        self.stats = {"leaders": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def do(self, key, fn, timeout=None):
+        """Run fn() once per key across threads; returns (result, shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+
+        if not leader:
+            if call.done.wait(self.timeout if timeout is None else timeout):
+                if call.error is not None:
+                    raise call.error
+                self._count("coalesced")
+                return call.result, True
+            self._count("timeouts")
+            return fn(), False
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            self._count("errors")
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, fn, timeout=None):
+        """Await fn() once per key within an event loop; returns (result, shared)
+
+        If the leader task is cancelled, its followers were not: they retry
+        and one of them becomes the new leader.
+        """
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+
+        while True:
+            future = self._futures.get(slot)
+            if future is None:
+                break
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(future), self.timeout if timeout is None else timeout
+                )
+            except asyncio.TimeoutError:
+                self._count("timeouts")
+                return await fn(), False
+            if result is _LEADER_CANCELLED:
+                continue
+            self._count("coalesced")
+            return result, True
+
+        future = self._futures[slot] = loop.create_future()
+        self._count("leaders")
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+            self._count("errors")
+            raise
+        finally:
+            del self._futures[slot]
+
+
+class CoalescingGateway(CachedGateway):
+    """CachedGateway whose identical in-flight requests share one gateway call"""
+
+    def __init__(self, cache=None, session=None, flight=None):
+        super().__init__(cache=cache, session=session)
+        self.flight = flight or SingleFlight()
+        self.stats["coalesced_cost_saved"] = 0.0
+        self.stats["paid_calls_saved"] = 0
+
+    def _shared(self, result, shared):
+        data, info = result
+        if not shared:
+            return data, info
+        # Following a local or gateway cache hit saves nothing: that answer was free anyway
+        paid = 0.0
+        if info["cache"] == "miss":
+            paid = info["cost"] + info["cost_saved"]
+            with self._lock:
+                self.stats["paid_calls_saved"] += 1
+                self.stats["coalesced_cost_saved"] += paid
+        return copy.deepcopy(data), {"cache": "coalesced", "cost": 0.0, "cost_saved": paid}
+
+    def chat(self, model, messages, enable_cache=True, cache_ttl=None, headers=None, **params):
+        call = lambda: super(CoalescingGateway, self).chat(
+            model, messages, enable_cache, cache_ttl, headers, **params
+        )
+        if not enable_cache:
+            return call()
+        key = canonical_key(model, messages, params)
+        return self._shared(*self.flight.do(key, call))
+
+    async def achat(self, model, messages, enable_cache=True, cache_ttl=None,
+                    headers=None, **params):
+        """asyncio variant; the blocking call runs in the default executor"""
+        call = lambda: asyncio.to_thread(
+            super(CoalescingGateway, self).chat,
+            model, messages, enable_cache, cache_ttl, headers, **params
+        )
+        if not enable_cache:
+            return await call()
+        key = canonical_key(model, messages, params)
+        return self._shared(*await self.flight.do_async(key, call))
+
+    def savings_report(self):
+        report = super().savings_report()
+        report["paid_calls_saved"] = self.stats["paid_calls_saved"]
+        report["total_cost_saved"] += self.stats["coalesced_cost_saved"]
+        return report
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Single-Flight Request Coalescing\n")
+
+    gateway = CoalescingGateway()
+
+    try:
+        print("1️⃣ 50 threads ask the same question at once...")
+        messages = [{"role": "user", "content": "What is the capital of France?"}]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            results = list(pool.map(lambda _: gateway.chat("gpt-4", messages), range(50)))
+        statuses = [info["cache"] for _, info in results]
+        print(f"   {time.perf_counter() - start:.2f}s, "
+              f"{statuses.count('coalesced')} coalesced, "
+              f"{statuses.count('local')} local, "
+              f"{len(statuses) - statuses.count('coalesced') - statuses.count('local')} gateway")
+
+        print("\n2️⃣ 50 asyncio tasks ask another question at once...")
+        messages = [{"role": "user", "content": "Explain machine learning"}]
+
+        async def burst():
+            return await asyncio.gather(*(gateway.achat("gpt-4", messages) for _ in range(50)))
+
+        start = time.perf_counter()
+        statuses = [info["cache"] for _, info in asyncio.run(burst())]
+        print(f"   {time.perf_counter() - start:.2f}s, "
+              f"{statuses.count('coalesced')} coalesced")
+
+        report = gateway.savings_report()
+        flight = gateway.flight.stats
+        print("\n📊 Coalescing statistics:")
+        print(f"  Leaders (paid or cached calls): {flight['leaders']}")
+        print(f"  Paid calls saved: {report['paid_calls_saved']}")
+        print(f"  Follower timeouts: {flight['timeouts']}")
+        print(f"  Leader errors propagated: {flight['errors']}")
+        print(f"  Coalesced Cost Saved: ${report['coalesced_cost_saved']:.6f}")
+        print(f"  Total Cost Saved: ${report['total_cost_saved']:.6f}")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Cost Katana Key Vault: Cached Key Directory (Python)
+
+Load proxy and provider keys once, keep them fresh from a background
+thread, and resolve key metadata per request from an in-memory index by
+key ID or key prefix. Refreshes are conditional (ETag) and applied as a
+diff; readers never wait for a refresh.
+
+Run: python 15-key-vault/python-sdk/key_directory.py
+"""
+
+import bisect
+import os
+import threading
+import time
+
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+SOURCES = {
+    "proxy": f"{API_BASE}/key-vault/proxy-keys",
+    "provider": f"{API_BASE}/key-vault/provider-keys",
+}
+
+# Fields that carry the (possibly masked) key string, in preference order
+KEY_FIELDS = ("proxyKey", "maskedKey", "keyPrefix", "apiKey")
+
+
+def _key_id(record):
+    return record.get("_id") or record.get("id")
+
+
+def _key_string(record):
+    for field in KEY_FIELDS:
+        value = record.get(field)
+        if value:
+            return value.rstrip("*.")  # masked keys keep their visible prefix
+    return None
+
+
+class _Snapshot:
+    """Immutable index; refreshes build a new one and swap the reference"""
+
+    __slots__ = ("by_id", "prefixes", "prefix_ids", "by_prefix", "lengths", "loaded_at")
+
+    def __init__(self, by_id, loaded_at):
+        self.by_id = by_id
+        pairs = sorted(
+            (key, key_id) for key_id, (_, record) in by_id.items()
+            if (key := _key_string(record))
+        )
+        self.prefixes = [key for key, _ in pairs]
+        self.prefix_ids = [key_id for _, key_id in pairs]
+        self.by_prefix = dict(pairs)
+        # Longest first, so resolve() returns the most specific match
+        self.lengths = sorted({len(key) for key in self.prefixes}, reverse=True)
+        self.loaded_at = loaded_at
+
+
+class KeyDirectory:
+    """In-memory proxy/provider key index with background incremental refresh"""
+
+    def __init__(self, refresh_interval=30, session=None, sources=SOURCES):
+        self.refresh_interval = refresh_interval
+        self.session = session or requests.Session()
+        self.sources = sources
+        self.stats = {"refreshes": 0, "not_modified": 0, "added": 0, "updated": 0,
+                      "removed": 0, "errors": 0}
+        self._snapshot = _Snapshot({}, None)
+        self._etags = {}
+        self._records = {kind: {} for kind in sources}   # kind -> {id: record}
+        self._refresh_lock = threading.Lock()
+        self._stop = None
+
+    def _fetch(self, kind):
+        """Conditional GET; (records, etag), records None when the list has not changed"""
+        headers = {"Authorization": f"Bearer {API_KEY}"}
+        if self._etags.get(kind):
+            headers["If-None-Match"] = self._etags[kind]
+        response = self.session.get(self.sources[kind], headers=headers, timeout=30)
+        if response.status_code == 304:
+            return None, self._etags[kind]
+        response.raise_for_status()
+        return response.json()["data"], response.headers.get("ETag")
+
+    def refresh(self):
+        """Fetch every source and apply only the changed records
+
+        New ETags and records are staged and committed together with the
+        snapshot swap, only once every source has been fetched; a failure
+        part-way leaves the previous state, so the next refresh refetches.
+        """
+        with self._refresh_lock:
+            etags, staged = {}, {}
+            counts = {"not_modified": 0, "added": 0, "updated": 0, "removed": 0}
+            for kind in self.sources:
+                records, etags[kind] = self._fetch(kind)
+                if records is None:
+                    counts["not_modified"] += 1
+                    continue
+                current = self._records[kind]
+                latest = {_key_id(record): record for record in records if _key_id(record)}
+                for key_id, record in latest.items():
+                    old = current.get(key_id)
+                    if old is None:
+                        counts["added"] += 1
+                    elif old != record:
+                        counts["updated"] += 1
+                removed = current.keys() - latest.keys()
+                counts["removed"] += len(removed)
+                staged[kind] = latest
+
+            changed = bool(counts["added"] or counts["updated"] or counts["removed"])
+            self._etags.update(etags)
+            self._records.update(staged)
+            for name, count in counts.items():
+                self.stats[name] += count
+            self.stats["refreshes"] += 1
+            if changed or self._snapshot.loaded_at is None:
+                by_id = {
+                    key_id: (kind, record)
+                    for kind, records in self._records.items()
+                    for key_id, record in records.items()
+                }
+                self._snapshot = _Snapshot(by_id, time.time())
+            return changed
+
+    def get(self, key_id):
+        """(kind, record) for a key ID, or None"""
+        return self._snapshot.by_id.get(key_id)
+
+    def find_prefix(self, prefix, limit=10):
+        """Keys whose key string starts with `prefix`, e.g. "pk_live_ab" """
+        snapshot = self._snapshot
+        start = bisect.bisect_left(snapshot.prefixes, prefix)
+        found = []
+        for i in range(start, min(start + limit, len(snapshot.prefixes))):
+            if not snapshot.prefixes[i].startswith(prefix):
+                break
+            found.append(snapshot.by_id[snapshot.prefix_ids[i]])
+        return found
+
+    def resolve(self, key):
+        """Metadata for a full key string as presented in an Authorization header"""
+        snapshot = self._snapshot
+        for length in snapshot.lengths:
+            if length <= len(key):
+                key_id = snapshot.by_prefix.get(key[:length])
+                if key_id is not None:
+                    return snapshot.by_id[key_id]
+        return None
+
+    def __len__(self):
+        return len(self._snapshot.by_id)
+
+    def _loop(self, stop):
+        while not stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                self.stats["errors"] += 1
+                print(f"⚠️  Key directory refresh failed: {e}")
+
+    def start(self):
+        """Initial blocking load, then refresh in the background"""
+        self.refresh()
+        self._stop = threading.Event()
+        threading.Thread(target=self._loop, args=(self._stop,), daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._stop:
+            self._stop.set()
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Key Vault: Cached Key Directory\n")
+
+    try:
+        directory = KeyDirectory(refresh_interval=30).start()
+        print(f"1️⃣ Loaded {len(directory)} keys")
+
+        sample = directory.find_prefix("pk_", limit=1)
+        if sample:
+            kind, record = sample[0]
+            key = record["proxyKey"]
+            print(f"2️⃣ Resolved {key[:10]}… → {kind} key '{record.get('name')}'")
+
+            start = time.perf_counter()
+            for _ in range(100_000):
+                directory.resolve(key)
+            elapsed_us = (time.perf_counter() - start) / 100_000 * 1_000_000
+            print(f"   Lookup: {elapsed_us:.2f}µs (no network)")
+
+        directory.refresh()
+        print(f"\n3️⃣ Refresh stats: {directory.stats}")
+        directory.stop()
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Cost Katana Key Vault: Multi-Key Load Balancer (Python)
+
+Spread gateway requests across several keys instead of one. Each key has
+a token bucket sized to its rate limit; requests go to the least-loaded
+(or weighted) key with capacity, and a key that returns 429 cools down
+automatically. Aggregate throughput scales with the number of keys.
+
+Run: python 15-key-vault/python-sdk/key_pool.py
+     python 15-key-vault/python-sdk/key_pool.py --simulate
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+
+from proxy_keys import list_proxy_keys
+
+API_BASE = "https://api.costkatana.com/api"
+GATEWAY_URL = f"{API_BASE}/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+
+class TokenBucket:
+    """`rate` tokens per second, bursting up to `capacity`"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self):
+        self._refill()
+        return self.tokens
+
+    def take(self):
+        self._refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def wait_time(self):
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class PooledKey:
+    def __init__(self, key_id, token, requests_per_minute=60, weight=1.0,
+                 name=None, clock=time.monotonic):
+        self.id = key_id
+        self.name = name or key_id
+        self.token = token
+        self.weight = weight
+        self.bucket = TokenBucket(requests_per_minute / 60, max(1, requests_per_minute / 6),
+                                  clock)
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.strikes = 0
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+
+
+class KeyPool:
+    """Thread-safe selection over PooledKeys
+
+    strategy="least_loaded" picks the key with the fewest in-flight requests
+    (most spare tokens breaks ties); strategy="weighted" picks randomly in
+    proportion to weight x spare tokens.
+    """
+
+    def __init__(self, keys, strategy="least_loaded", base_cooldown=1.0,
+                 max_cooldown=60.0, clock=time.monotonic, sleep=time.sleep):
+        if not keys:
+            raise ValueError("KeyPool needs at least one key")
+        self.keys = list(keys)
+        self.strategy = strategy
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_proxy_keys(cls, records, **kwargs):
+        """Build a pool from key-vault proxy key records (rateLimit.requestsPerMinute)"""
+        keys = [
+            PooledKey(
+                record.get("_id") or record.get("id") or record["proxyKey"][:12],
+                record["proxyKey"],
+                requests_per_minute=(record.get("rateLimit") or {}).get("requestsPerMinute", 60),
+                weight=record.get("weight", 1.0),
+                name=record.get("name"),
+                clock=kwargs.get("clock", time.monotonic),
+            )
+            for record in records
+            if record.get("proxyKey") and record.get("status", "active") == "active"
+        ]
+        return cls(keys, **kwargs)
+
+    def _pick(self):
+        now = self.clock()
+        ready = [key for key in self.keys
+                 if key.cooldown_until <= now and key.bucket.available() >= 1]
+        if not ready:
+            return None
+        if self.strategy == "weighted":
+            weights = [key.weight * key.bucket.available() for key in ready]
+            return random.choices(ready, weights=weights)[0]
+        return min(ready, key=lambda key: (key.in_flight, -key.bucket.available()))
+
+    def _wait_time(self):
+        now = self.clock()
+        return min(
+            max(key.cooldown_until - now, key.bucket.wait_time()) for key in self.keys
+        )
+
+    def acquire(self, timeout=30.0):
+        """Block until some key has capacity; returns the key (call release after)"""
+        deadline = self.clock() + timeout
+        while True:
+            with self._lock:
+                key = self._pick()
+                if key is not None:
+                    key.bucket.take()
+                    key.in_flight += 1
+                    key.stats["requests"] += 1
+                    return key
+                wait = self._wait_time()
+            if self.clock() + wait > deadline:
+                raise TimeoutError("no key in the pool has capacity")
+            self.sleep(max(wait, 0.001))
+
+    def release(self, key, status_code=200, retry_after=None):
+        """Return a key; a 429 puts it in exponential cooldown (or Retry-After)"""
+        with self._lock:
+            key.in_flight -= 1
+            if status_code == 429:
+                key.strikes += 1
+                key.stats["throttled"] += 1
+                cooldown = retry_after if retry_after is not None else min(
+                    self.max_cooldown, self.base_cooldown * 2 ** (key.strikes - 1)
+                )
+                key.cooldown_until = self.clock() + cooldown
+                key.bucket.tokens = 0
+            elif status_code >= 500:
+                key.stats["errors"] += 1
+            else:
+                key.strikes = 0
+
+    def status(self):
+        now = self.clock()
+        with self._lock:
+            return [
+                {
+                    "id": key.id, "name": key.name, "inFlight": key.in_flight,
+                    "tokens": round(key.bucket.available(), 2),
+                    "coolingDown": max(0.0, key.cooldown_until - now), **key.stats,
+                }
+                for key in self.keys
+            ]
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class PooledGateway:
+    """Gateway client that sends each request with a key from the pool"""
+
+    def __init__(self, pool, session=None):
+        self.pool = pool
+        self.session = session or requests.Session()
+
+    def chat(self, model, messages, timeout=30.0, **params):
+        attempts = len(self.pool.keys) + 1
+        for attempt in range(attempts):
+            key = self.pool.acquire(timeout)
+            try:
+                response = self.session.post(
+                    GATEWAY_URL,
+                    json={"model": model, "messages": messages, **params},
+                    headers={"Authorization": f"Bearer {key.token}"}
+                )
+            except requests.exceptions.RequestException:
+                self.pool.release(key, 599)
+                raise
+            self.pool.release(key, response.status_code, _retry_after(response))
+            if response.status_code == 429 and attempt < attempts - 1:
+                continue  # another key may still have headroom
+            response.raise_for_status()
+            return response.json(), key.name
+
+
+def simulate(key_counts=(1, 2, 4, 8), rpm=600, seconds=60, strategy="least_loaded"):
+    """Simulated clock: saturate a pool whose keys each allow `rpm` requests/minute"""
+    for count in key_counts:
+        clock = [0.0]
+        now = lambda: clock[0]
+
+        def advance(seconds_):
+            clock[0] += seconds_
+
+        keys = [PooledKey(f"key-{i}", f"pk_{i}", requests_per_minute=rpm, clock=now)
+                for i in range(count)]
+        pool = KeyPool(keys, strategy=strategy, clock=now, sleep=advance)
+        # The provider enforces the same limit and answers 429 above it
+        provider = {key.id: TokenBucket(rpm / 60, rpm / 60, now) for key in keys}
+        served = throttled = 0
+        while clock[0] < seconds:
+            key = pool.acquire(timeout=seconds)
+            ok = provider[key.id].take()
+            served += ok
+            throttled += not ok
+            pool.release(key, 200 if ok else 429)
+            advance(0.001)
+        print(f"   {count} key(s): {served / seconds:,.1f} req/s served, {throttled} throttled")
+
+
+def main():
+    if "--simulate" in sys.argv:
+        print("⏱️  Throughput vs key count (simulated 600 rpm per key, 60s)")
+        simulate()
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Key Vault: Multi-Key Load Balancer\n")
+
+    try:
+        records = list_proxy_keys()
+        pool = KeyPool.from_proxy_keys(records)
+        gateway = PooledGateway(pool)
+        print(f"1️⃣ Balancing across {len(pool.keys)} active proxy keys\n")
+
+        messages = [{"role": "user", "content": "Say hello in one word"}]
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(gateway.chat("gpt-3.5-turbo", messages)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"2️⃣ {len(results)} requests served")
+        for key in pool.status():
+            print(f"  {key['name']}: {key['requests']} requests, {key['throttled']} throttled, "
+                  f"{key['tokens']} tokens left")
+
+    except (ValueError, TimeoutError) as e:
+        print(f"❌ Error: {e}")
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
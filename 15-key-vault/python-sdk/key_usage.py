@@ -0,0 +1,242 @@
+"""
+Cost Katana Key Vault: Local Per-Key Usage Rollups (Python)
+
+Attribute every gateway response's cost and tokens to the key that sent
+it and roll them up per minute and per hour in compact array-backed ring
+buffers, flushed to a local file. Per-key spend and throughput without a
+round trip to /key-vault/analytics.
+
+Run: python 15-key-vault/python-sdk/key_usage.py
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from array import array
+
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+GATEWAY_URL = f"{API_BASE}/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+USAGE_PATH = os.getenv("COST_KATANA_USAGE_PATH", "key-usage.json")
+
+# resolution -> (bucket seconds, buckets kept)
+RESOLUTIONS = {"minute": (60, 1440), "hour": (3600, 720)}
+
+COLUMNS = {"requests": "I", "errors": "I", "tokens": "Q", "cost": "d"}
+
+
+class _Series:
+    """One ring of buckets: parallel typed arrays indexed by epoch % slots"""
+
+    def __init__(self, width, slots):
+        self.width = width
+        self.slots = slots
+        self.epochs = array("q", [-1]) * slots
+        self.columns = {name: array(code, [0]) * slots for name, code in COLUMNS.items()}
+
+    def add(self, at, requests_count, errors, tokens, cost):
+        epoch = int(at // self.width)
+        i = epoch % self.slots
+        if self.epochs[i] != epoch:
+            self.epochs[i] = epoch
+            for column in self.columns.values():
+                column[i] = 0
+        columns = self.columns
+        columns["requests"][i] += requests_count
+        columns["errors"][i] += errors
+        columns["tokens"][i] += tokens
+        columns["cost"][i] += cost
+
+    def rows(self, since=None):
+        """[(bucket start, {column: value})] oldest first"""
+        oldest = since // self.width if since is not None else -1
+        return sorted(
+            (epoch * self.width, {name: column[i] for name, column in self.columns.items()})
+            for i, epoch in enumerate(self.epochs) if epoch >= 0 and epoch >= oldest
+        )
+
+    def to_dict(self):
+        return {"epochs": self.epochs.tolist(),
+                **{name: column.tolist() for name, column in self.columns.items()}}
+
+    @classmethod
+    def from_dict(cls, width, slots, data):
+        series = cls(width, slots)
+        if len(data.get("epochs", ())) == slots:
+            series.epochs = array("q", data["epochs"])
+            series.columns = {name: array(code, data[name]) for name, code in COLUMNS.items()}
+        return series
+
+
+def _bearer(request):
+    auth = (request.headers.get("Authorization") or "") if request is not None else ""
+    return auth[7:] if auth.startswith("Bearer ") else None
+
+
+class KeyUsageRollup:
+    """Per-key usage buckets at minute and hour resolution"""
+
+    def __init__(self, path=USAGE_PATH, resolutions=RESOLUTIONS, directory=None,
+                 flush_interval=60):
+        self.path = path
+        self.resolutions = resolutions
+        self.directory = directory  # optional KeyDirectory to map key strings to IDs
+        self.flush_interval = flush_interval
+        self._keys = {}             # key id -> {resolution: _Series}
+        self._lock = threading.Lock()
+        self._stop = None
+        if path and os.path.exists(path):
+            self.load()
+
+    def _series(self, key_id):
+        series = self._keys.get(key_id)
+        if series is None:
+            series = self._keys[key_id] = {
+                name: _Series(width, slots) for name, (width, slots) in self.resolutions.items()
+            }
+        return series
+
+    def key_id(self, key):
+        """Stable ID for a presented key; never stores the full secret"""
+        if self.directory is not None:
+            found = self.directory.resolve(key)
+            if found is not None:
+                kind, record = found
+                return f"{kind}:{record.get('_id') or record.get('id')}"
+        # Unknown key: a short digest, so no part of the secret reaches the rollup file
+        return f"key:{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+    def record(self, key_id, cost=0.0, tokens=0, ok=True, at=None):
+        at = time.time() if at is None else at
+        with self._lock:
+            for series in self._series(key_id).values():
+                series.add(at, 1, not ok, tokens, cost)
+
+    def record_response(self, response, data=None, key_id=None):
+        """Attribute one gateway response; pass `data` if the body is already decoded"""
+        if key_id is None:
+            key = _bearer(response.request)
+            key_id = self.key_id(key) if key else "unknown"
+        if data is None and response.ok:
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+        usage = (data or {}).get("usage") or {}
+        self.record(
+            key_id,
+            cost=float(response.headers.get("X-Cost") or 0),
+            tokens=int(usage.get("total_tokens") or 0),
+            ok=response.ok,
+        )
+
+    def instrument(self, session):
+        """Response hook; decodes the body once more to read `usage`"""
+        session.hooks["response"].append(
+            lambda response, *args, **kwargs: self.record_response(response)
+        )
+        return session
+
+    def rollup(self, key_id, resolution="minute", since=None):
+        with self._lock:
+            series = self._keys.get(key_id, {}).get(resolution)
+            return series.rows(since) if series else []
+
+    def totals(self, since_seconds=3600, resolution="minute"):
+        """{key id: {requests, errors, tokens, cost}} over the recent window"""
+        since = time.time() - since_seconds
+        with self._lock:
+            result = {}
+            for key_id, series in self._keys.items():
+                total = dict.fromkeys(COLUMNS, 0)
+                for _, row in series[resolution].rows(since):
+                    for name, value in row.items():
+                        total[name] += value
+                if total["requests"]:
+                    result[key_id] = total
+            return result
+
+    def flush(self):
+        """Atomically write every key's buckets to `path`"""
+        with self._lock:
+            payload = {
+                "resolutions": {name: list(spec) for name, spec in self.resolutions.items()},
+                "keys": {key_id: {name: s.to_dict() for name, s in series.items()}
+                         for key_id, series in self._keys.items()},
+            }
+        scratch = f"{self.path}.tmp"
+        with open(scratch, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(scratch, self.path)
+
+    def load(self):
+        with open(self.path) as f:
+            payload = json.load(f)
+        saved = {name: tuple(spec) for name, spec in payload.get("resolutions", {}).items()}
+        with self._lock:
+            for key_id, series in payload.get("keys", {}).items():
+                self._keys[key_id] = {
+                    name: _Series.from_dict(width, slots, series.get(name, {}))
+                    if saved.get(name) == (width, slots) else _Series(width, slots)
+                    for name, (width, slots) in self.resolutions.items()
+                }
+
+    def _loop(self, stop):
+        while not stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"⚠️  Usage flush failed: {e}")
+
+    def start(self):
+        self._stop = threading.Event()
+        threading.Thread(target=self._loop, args=(self._stop,), daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._stop:
+            self._stop.set()
+        self.flush()
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Key Vault: Local Per-Key Usage Rollups\n")
+
+    usage = KeyUsageRollup().start()
+    session = requests.Session()
+    keys = [API_KEY] + [key for key in os.getenv("COST_KATANA_PROXY_KEYS", "").split(",") if key]
+
+    try:
+        print(f"1️⃣ Sending requests with {len(keys)} key(s)...")
+        for i in range(6):
+            response = session.post(
+                GATEWAY_URL,
+                json={"model": "gpt-3.5-turbo",
+                      "messages": [{"role": "user", "content": f"Count to {i + 1}"}]},
+                headers={"Authorization": f"Bearer {keys[i % len(keys)]}"}
+            )
+            data = response.json() if response.ok else None
+            usage.record_response(response, data)
+            response.raise_for_status()
+
+        print("\n📈 Last hour per key (local, no server round trip):")
+        for key_id, total in usage.totals(3600).items():
+            print(f"  {key_id}: {total['requests']} requests, {total['errors']} errors, "
+                  f"{total['tokens']:,} tokens, ${total['cost']:.6f}")
+
+        usage.stop()
+        print(f"\n💾 Flushed to {usage.path} ({os.path.getsize(usage.path) / 1024:.0f} KB)")
+
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.json() if e.response else e}")
+
+if __name__ == "__main__":
+    main()
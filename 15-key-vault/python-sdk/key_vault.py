@@ -26,8 +26,9 @@ def list_provider_keys():
         headers={"Authorization": f"Bearer {API_KEY}"}
     )
     response.raise_for_status()
-    print(f"📋 Found {len(response.json()['data'])} keys")
-    return response.json()["data"]
+    keys = response.json()["data"]
+    print(f"📋 Found {len(keys)} keys")
+    return keys
 
 if __name__ == "__main__":
     print("🥷 Key Vault: Provider Keys\n")
@@ -17,8 +17,9 @@ def create_proxy_key(config):
         headers={"Authorization": f"Bearer {API_KEY}"}
     )
     response.raise_for_status()
-    print(f"✅ Created proxy key: {response.json()['data']['proxyKey']}")
-    return response.json()["data"]
+    data = response.json()["data"]
+    print(f"✅ Created proxy key: {data['proxyKey']}")
+    return data
 
 def list_proxy_keys():
     response = requests.get(
@@ -26,8 +27,9 @@ def list_proxy_keys():
         headers={"Authorization": f"Bearer {API_KEY}"}
     )
     response.raise_for_status()
-    print(f"📋 Found {len(response.json()['data'])} proxy keys")
-    return response.json()["data"]
+    keys = response.json()["data"]
+    print(f"📋 Found {len(keys)} proxy keys")
+    return keys
 
 if __name__ == "__main__":
     print("🥷 Key Vault: Proxy Keys\n")
@@ -0,0 +1,209 @@
+"""
+Cost Katana Monitoring: Conditional Delta Polling (Python)
+
+Poll telemetry, monitoring metrics and cost trends with ETag /
+If-Modified-Since, fall back to local diffs against the last snapshot,
+and fan changed fields out to every subscriber from one shared poller.
+
+Run: python 17-monitoring/python-sdk/polling.py
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import requests
+
+API_BASE = "https://api.costkatana.com/api"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+ENDPOINTS = {
+    "telemetry": f"{API_BASE}/telemetry",
+    "metrics": f"{API_BASE}/monitoring/metrics",
+    "cost_trends": f"{API_BASE}/monitoring/cost-trends",
+}
+
+_MISSING = object()
+
+
+def flatten(value, prefix="", out=None):
+    """Flatten nested dicts into {"a.b.c": leaf} so diffs are per field"""
+    if out is None:
+        out = {}
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            flatten(item, f"{prefix}.{key}" if prefix else str(key), out)
+    else:
+        out[prefix] = value
+    return out
+
+
+def diff(previous, current):
+    """{field: (old, new)} for changed, added and removed fields"""
+    changes = {}
+    for key, value in current.items():
+        old = previous.get(key, _MISSING)
+        if old is _MISSING or old != value:
+            changes[key] = (None if old is _MISSING else old, value)
+    for key in previous.keys() - current.keys():
+        changes[key] = (previous[key], None)
+    return changes
+
+
+def _select(changes, fields):
+    if fields is None:
+        return changes
+    return {key: change for key, change in changes.items() if key.startswith(fields)}
+
+
+class DeltaPoller:
+    """Polls one endpoint and emits only the fields that changed"""
+
+    def __init__(self, url, interval=5, session=None):
+        self.url = url
+        self.interval = interval
+        self.session = session or requests.Session()
+        self.snapshot = {}
+        self.stats = {"polls": 0, "not_modified": 0, "unchanged_body": 0, "changed": 0}
+        self._etag = None
+        self._last_modified = None
+        self._body_digest = None
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._stop = None
+
+    def poll(self):
+        """One conditional fetch; returns the changed fields (empty if nothing changed)"""
+        headers = {"Authorization": f"Bearer {API_KEY}"}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        response = self.session.get(self.url, headers=headers, timeout=10)
+        self.stats["polls"] += 1
+        if response.status_code == 304:
+            self.stats["not_modified"] += 1
+            return {}
+        response.raise_for_status()
+        self._etag = response.headers.get("ETag", self._etag)
+        self._last_modified = response.headers.get("Last-Modified", self._last_modified)
+
+        # Servers without validators: skip JSON decoding when the bytes are identical
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if digest == self._body_digest:
+            self.stats["unchanged_body"] += 1
+            return {}
+        self._body_digest = digest
+
+        payload = response.json()
+        if isinstance(payload, dict):
+            payload = payload.get("data", payload)
+        current = flatten(payload)
+        changes = diff(self.snapshot, current)
+        self.snapshot = current
+        if changes:
+            self.stats["changed"] += 1
+            self._emit(changes)
+        return changes
+
+    def subscribe(self, callback, fields=None):
+        """Call `callback(changes)` on change; `fields` filters by field prefix"""
+        token = object()
+        with self._lock:
+            self._subscribers[token] = (callback, tuple(fields) if fields else None)
+            if self._stop is None:
+                self._stop = threading.Event()
+                threading.Thread(target=self._run, args=(self._stop,), daemon=True).start()
+        if self.snapshot:
+            initial = _select({key: (None, value) for key, value in self.snapshot.items()},
+                              self._subscribers[token][1])
+            if initial:
+                callback(initial)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+            if not self._subscribers and self._stop is not None:
+                self._stop.set()
+                self._stop = None
+
+    def _emit(self, changes):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, fields in subscribers:
+            selected = _select(changes, fields)
+            if selected:
+                # One failing subscriber must not stop the others or the poller
+                try:
+                    callback(selected)
+                except Exception as e:
+                    print(f"⚠️  Subscriber {getattr(callback, '__name__', callback)} failed: {e!r}")
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                self.poll()
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️  Poll failed for {self.url}: {e}")
+            except ValueError as e:  # non-JSON body
+                print(f"⚠️  Bad response from {self.url}: {e}")
+            stop.wait(self.interval)
+
+
+class PollerHub:
+    """Shares one poller (and one connection pool) per endpoint across subscribers"""
+
+    def __init__(self, interval=5):
+        self.interval = interval
+        self.session = requests.Session()
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    def poller(self, name):
+        url = ENDPOINTS.get(name, name)
+        with self._lock:
+            poller = self._pollers.get(url)
+            if poller is None:
+                poller = self._pollers[url] = DeltaPoller(url, self.interval, self.session)
+            return poller
+
+    def subscribe(self, name, callback, fields=None):
+        poller = self.poller(name)
+        return poller, poller.subscribe(callback, fields)
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("🥷 Cost Katana Conditional Delta Polling\n")
+
+    hub = PollerHub(interval=5)
+
+    def printer(label):
+        def on_change(changes):
+            print(f"🔔 {label}: {len(changes)} field(s) changed")
+            for field, (old, new) in list(changes.items())[:5]:
+                print(f"   {field}: {old} → {new}")
+        return on_change
+
+    # Two dashboards on the same endpoint share one poller
+    hub.subscribe("telemetry", printer("Latency panel"), fields=["metrics.average_latency_ms"])
+    hub.subscribe("telemetry", printer("Cost panel"), fields=["metrics.cost_per_hour"])
+    hub.subscribe("metrics", printer("Monitoring metrics"))
+    hub.subscribe("cost_trends", printer("Cost trends"))
+
+    time.sleep(30)
+
+    print("\n📊 Poller stats:")
+    for name in ENDPOINTS:
+        stats = hub.poller(name).stats
+        print(f"   {name}: {stats['polls']} polls, {stats['not_modified']} not modified, "
+              f"{stats['unchanged_body']} unchanged bodies, {stats['changed']} with changes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+Cost Katana Python SDK: Async Facade
+Awaitable counterparts of ck.ai, ck.chat and the CostKatana client
+namespaces (governance, network_effects), all sharing one pooled aiohttp
+session. A single asyncio thread can keep thousands of AI calls in flight
+with no thread per request; the connector caps open sockets and reuses them.
+
+Requires: pip install aiohttp
+
+Run: python 8-python-sdk/basic/aio.py             (benchmark against a local stand-in server)
+     python 8-python-sdk/basic/aio.py --live      (real calls through the gateway)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+GATEWAY_URL = "https://api.costkatana.com/api/gateway/v1/chat/completions"
+API_BASE = "https://api.costkatana.com/v1"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+
+class AsyncTransport:
+    """One keep-alive aiohttp session per event loop, shared by every call
+
+    `max_connections` bounds open sockets; calls beyond it wait for a free
+    connection instead of opening more, so in-flight calls are limited only
+    by memory. Call close() (or use `async with`) before a loop that used
+    the transport ends; it closes that loop's session.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, gateway_url: str = GATEWAY_URL,
+                 api_base: str = API_BASE, max_connections: int = 512, timeout: float = 120):
+        self.api_key = api_key or API_KEY
+        self.gateway_url = gateway_url
+        self.api_base = api_base.rstrip('/')
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        # aiohttp sessions are bound to the loop that created them, so keep one per loop
+        self._sessions = weakref.WeakKeyDictionary()   # loop -> ClientSession
+
+    def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections,
+                                               limit_per_host=self.max_connections,
+                                               ttl_dns_cache=300),
+                timeout=self.timeout,
+                headers={'Authorization': f'Bearer {self.api_key}'},
+            )
+        return session
+
+    async def request(self, method: str, url: str, **kwargs):
+        """JSON body and response headers; raises aiohttp.ClientResponseError on 4xx/5xx"""
+        async with self.session().request(method, url, **kwargs) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+            return data, response.headers
+
+    async def api(self, method: str, path: str, json: Optional[dict] = None,
+                  params: Optional[dict] = None):
+        data, _ = await self.request(method, f"{self.api_base}{path}", json=json,
+                                     params=params)
+        return data
+
+    async def close(self):
+        """Close the running loop's session"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+_default_transport: Optional[AsyncTransport] = None
+
+
+def default_transport() -> AsyncTransport:
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = AsyncTransport()
+    return _default_transport
+
+
+class AIResponse:
+    """Same fields as a ck.ai response"""
+
+    __slots__ = ('text', 'model', 'cost', 'tokens', 'input_tokens', 'output_tokens',
+                 'provider', 'cached', 'latency')
+
+    def __init__(self, model: str, data: dict, headers, latency_ms: float):
+        usage = data.get('usage') or {}
+        self.text = data['choices'][0]['message']['content']
+        self.model = data.get('model', model)
+        self.cost = float(headers.get('X-Cost') or data.get('cost') or 0)
+        self.tokens = usage.get('total_tokens', 0)
+        self.input_tokens = usage.get('prompt_tokens', 0)
+        self.output_tokens = usage.get('completion_tokens', 0)
+        self.provider = headers.get('X-Provider')
+        self.cached = (headers.get('X-Cache-Status') or '').lower() == 'hit'
+        self.latency = latency_ms
+
+
+async def _complete(model: str, messages: List[dict], transport: AsyncTransport,
+                    options: Dict[str, Any]) -> AIResponse:
+    options = dict(options)
+    cache = options.pop('cache', False)
+    cortex = options.pop('cortex', False)
+    start = time.perf_counter()
+    data, headers = await transport.request(
+        'POST', transport.gateway_url,
+        json={'model': model, 'messages': messages, **options},
+        headers={'X-Enable-Cache': 'true' if cache else 'false',
+                 'X-Enable-Cortex': 'true' if cortex else 'false'},
+    )
+    return AIResponse(model, data, headers, (time.perf_counter() - start) * 1000)
+
+
+async def ai_async(model: str, prompt: str, transport: Optional[AsyncTransport] = None,
+                   **options) -> AIResponse:
+    """Awaitable counterpart of ck.ai(model, prompt, **options)"""
+    return await _complete(model, [{'role': 'user', 'content': prompt}],
+                           transport or default_transport(), options)
+
+
+class AsyncChat:
+    """Awaitable counterpart of ck.chat; one send at a time per session"""
+
+    def __init__(self, model: str, system_message: Optional[str] = None,
+                 transport: Optional[AsyncTransport] = None, **options):
+        self.model = model
+        self.options = options
+        self.transport = transport or default_transport()
+        self.history: List[dict] = []
+        if system_message:
+            self.history.append({'role': 'system', 'content': system_message})
+        self.total_cost = 0.0
+        self.total_tokens = 0
+        self._lock = asyncio.Lock()
+
+    async def send(self, message: str) -> str:
+        # Turns must not interleave, or history would pair the wrong replies
+        async with self._lock:
+            messages = self.history + [{'role': 'user', 'content': message}]
+            response = await _complete(self.model, messages, self.transport, self.options)
+            self.history = messages + [{'role': 'assistant', 'content': response.text}]
+            self.total_cost += response.cost
+            self.total_tokens += response.tokens
+            return response.text
+
+
+def _camel(options: Dict[str, Any]) -> Dict[str, Any]:
+    """agent_name='x' -> {'agentName': 'x'}; nested dicts are passed through as-is"""
+    camel = {}
+    for key, value in options.items():
+        head, *rest = key.split('_')
+        camel[head + ''.join(word.title() for word in rest)] = value
+    return camel
+
+
+class AsyncGovernance:
+    """Async client.governance, see 47-governance-security/http-headers/governance.http"""
+
+    def __init__(self, transport: AsyncTransport):
+        self._transport = transport
+
+    async def create_agent(self, **options):
+        return await self._transport.api('POST', '/governance/agents', json=_camel(options))
+
+    async def get_agent_permissions(self, agent_id: str):
+        return await self._transport.api('GET', f'/governance/agents/{agent_id}/permissions')
+
+    async def authenticate_agent(self, agent_token: str):
+        return await self._transport.api('POST', '/governance/authenticate',
+                                         json={'agentToken': agent_token})
+
+    async def check(self, **options):
+        return await self._transport.api('POST', '/governance/check', json=_camel(options))
+
+    async def execute_in_sandbox(self, **options):
+        return await self._transport.api('POST', '/governance/sandbox/execute',
+                                         json=_camel(options))
+
+    async def get_audit_logs(self, **filters):
+        return await self._transport.api('GET', '/governance/audit', params=_camel(filters))
+
+
+class AsyncNetworkEffects:
+    """Async client.network_effects, see 48-data-network-effects/http-headers/network-effects.http"""
+
+    def __init__(self, transport: AsyncTransport):
+        self._transport = transport
+
+    async def get_recommendations(self, types: Optional[List[str]] = None, **filters):
+        params = _camel(filters)
+        if types:
+            params['types'] = ','.join(types)
+        return await self._transport.api('GET', '/network-effects/recommendations',
+                                         params={k: str(v) for k, v in params.items()})
+
+    async def accept_recommendation(self, recommendation_id: str, **options):
+        return await self._transport.api(
+            'POST', f'/network-effects/recommendations/{recommendation_id}/accept',
+            json=_camel(options))
+
+    async def reject_recommendation(self, recommendation_id: str, **options):
+        return await self._transport.api(
+            'POST', f'/network-effects/recommendations/{recommendation_id}/reject',
+            json=_camel(options))
+
+    async def track_outcome(self, **options):
+        return await self._transport.api('POST', '/network-effects/outcomes',
+                                         json=_camel(options))
+
+    async def get_learning_stats(self, time_range: str = '30d'):
+        return await self._transport.api('GET', '/network-effects/learning/stats',
+                                         params={'timeRange': time_range})
+
+    async def get_benchmarks(self, **options):
+        return await self._transport.api('POST', '/network-effects/benchmarks',
+                                         json=_camel(options))
+
+
+class AsyncCostKatana:
+    """Async counterpart of costkatana.CostKatana
+
+        async with AsyncCostKatana() as client:
+            agent = await client.governance.create_agent(agent_name='bot', ...)
+    """
+
+    def __init__(self, api_key: Optional[str] = None, transport: Optional[AsyncTransport] = None):
+        # Only a transport created here is closed by close(); shared ones stay open
+        self._owns_transport = transport is None and api_key is not None
+        self.transport = transport or (AsyncTransport(api_key) if api_key
+                                       else default_transport())
+        self.governance = AsyncGovernance(self.transport)
+        self.network_effects = AsyncNetworkEffects(self.transport)
+
+    async def ai(self, model: str, prompt: str, **options) -> AIResponse:
+        return await ai_async(model, prompt, transport=self.transport, **options)
+
+    def chat(self, model: str, system_message: Optional[str] = None, **options) -> AsyncChat:
+        return AsyncChat(model, system_message, transport=self.transport, **options)
+
+    async def close(self):
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _serve_stand_in(latency_s: float):
+    """Local gateway stand-in on its own thread and loop; returns (url, stop)"""
+    from aiohttp import web
+
+    async def completions(request):
+        body = await request.json()
+        await asyncio.sleep(latency_s)
+        return web.json_response(
+            {'model': body['model'], 'choices': [{'message': {'content': 'ok'}}],
+             'usage': {'prompt_tokens': 12, 'completion_tokens': 1, 'total_tokens': 13}},
+            headers={'X-Cost': '0.000013', 'X-Provider': 'openai'},
+        )
+
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', completions)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0, backlog=4096)
+        loop.run_until_complete(site.start())
+        state['port'] = site._server.sockets[0].getsockname()[1]
+        state['runner'] = runner
+        ready.set()
+        loop.run_forever()
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(state['runner'].cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{state['port']}/v1/chat/completions", stop
+
+
+def benchmark(calls: int = 2000, latency_s: float = 0.2, concurrency=(64, 512)):
+    """Same calls, same 200ms server, same cap on calls in flight: one asyncio
+    thread vs a requests pool with one thread per in-flight call
+
+    Wall time is set by the cap (calls * latency / cap) for both; what differs
+    is what each in-flight call costs - a coroutine vs an OS thread and stack.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests
+
+    url, stop = _serve_stand_in(latency_s)
+    print(f"⏱️  {calls:,} calls, stand-in server answers in {latency_s * 1000:.0f}ms\n")
+
+    async def run_async(limit):
+        in_flight = peak = 0
+        gate = asyncio.Semaphore(limit)
+
+        async def one(i):
+            nonlocal in_flight, peak
+            async with gate:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    return await ai_async('gpt-3.5-turbo', f'Prompt {i}', transport=transport)
+                finally:
+                    in_flight -= 1
+
+        async with AsyncTransport('local', gateway_url=url, max_connections=limit) as transport:
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(one(i) for i in range(calls)))
+            elapsed = time.perf_counter() - start
+        return elapsed, peak, sum(r.cost for r in responses)
+
+    def run_threads(limit):
+        local = threading.local()
+
+        def call(i):
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            response = local.session.post(url, json={
+                'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': f'Prompt {i}'}]
+            }, timeout=60)
+            response.raise_for_status()
+            return response
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=limit) as pool:
+            list(pool.map(call, range(calls)))
+        return time.perf_counter() - start
+
+    try:
+        for limit in concurrency:
+            ideal = calls * latency_s / limit
+            print(f"   {limit} in flight (ideal {ideal:.2f}s):")
+            elapsed, peak, cost = asyncio.run(run_async(limit))
+            print(f"      {'asyncio, 1 thread:':<26}{elapsed:5.2f}s  {calls / elapsed:6,.0f} calls/sec  "
+                  f"peak in flight {peak:,}  (${cost:.4f} tracked)")
+            elapsed = run_threads(limit)
+            print(f"      {f'requests, {limit} threads:':<26}{elapsed:5.2f}s  {calls / elapsed:6,.0f} calls/sec")
+    finally:
+        stop()
+
+
+async def live_demo():
+    try:
+        await _live_calls()
+    finally:
+        await default_transport().close()   # shared transport: its owner closes it
+
+
+async def _live_calls():
+    async with AsyncCostKatana() as client:
+        print("1. Concurrent ai_async calls:\n")
+        prompts = ['What is Docker?', 'What is Kubernetes?', 'What is Terraform?']
+        responses = await asyncio.gather(
+            *(ai_async('gpt-3.5-turbo', p, transport=client.transport) for p in prompts)
+        )
+        for prompt, response in zip(prompts, responses):
+            print(f"   {prompt:<22} ${response.cost:.6f}  {response.latency:.0f}ms  "
+                  f"{response.text[:50]!r}")
+
+        print("\n2. Async chat session:\n")
+        chat = client.chat('gpt-4', system_message='You are a helpful AI assistant.')
+        for question in ['What is Docker?', 'How do I install it?']:
+            reply = await chat.send(question)
+            print(f"You: {question}\nAI: {reply[:100]}...\n")
+        print(f"💰 Total Session Cost: ${chat.total_cost:.6f}")
+        print(f"🎯 Total Tokens: {chat.total_tokens}")
+
+        print("\n3. Async client namespaces:\n")
+        try:
+            stats, recommendations = await asyncio.gather(
+                client.network_effects.get_learning_stats(time_range='30d'),
+                client.network_effects.get_recommendations(types=['model_switch'], limit=3),
+            )
+            print(f"   Learning stats: {stats}")
+            print(f"   Recommendations: {len(recommendations)}")
+        except aiohttp.ClientResponseError as e:
+            print(f"   ❌ Error: {e.status} {e.message}")
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Async Facade\n")
+
+    if '--live' not in sys.argv:
+        benchmark()
+        print("\n✅ Same concurrency, one thread instead of one per call!\n")
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    asyncio.run(live_demo())
+    print()
+
+if __name__ == '__main__':
+    main()
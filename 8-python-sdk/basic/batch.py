@@ -0,0 +1,130 @@
+"""
+Cost Katana Python SDK: Concurrent Batch Calls
+Run many ck.ai calls at once with a global and a per-provider concurrency
+limit, so a batch takes about as long as its slowest call.
+
+Run: python 8-python-sdk/basic/batch.py
+"""
+
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import cost_katana as ck
+
+# Model name prefix -> provider, for per-provider limits
+PROVIDER_PREFIXES = (
+    ('gpt-', 'openai'), ('o1', 'openai'), ('text-', 'openai'),
+    ('claude-', 'anthropic'),
+    ('gemini-', 'google'),
+    ('nova-', 'aws-bedrock'), ('anthropic.', 'aws-bedrock'), ('amazon.', 'aws-bedrock'),
+    ('meta.', 'aws-bedrock'), ('mistral.', 'aws-bedrock'),
+)
+
+DEFAULT_PROVIDER_LIMITS = {'openai': 4, 'anthropic': 2, 'google': 2, 'aws-bedrock': 2}
+
+
+class BatchResult(NamedTuple):
+    index: int
+    model: str
+    prompt: str
+    response: Any = None
+    error: Optional[Exception] = None
+    latency_ms: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def provider_for(model: str) -> str:
+    for prefix, provider in PROVIDER_PREFIXES:
+        if model.startswith(prefix):
+            return provider
+    return 'other'
+
+
+def _run(index, model, prompt, options):
+    start = time.perf_counter()
+    try:
+        response = ck.ai(model, prompt, **options)
+        return BatchResult(index, model, prompt, response,
+                           latency_ms=(time.perf_counter() - start) * 1000)
+    except Exception as e:
+        return BatchResult(index, model, prompt, error=e,
+                           latency_ms=(time.perf_counter() - start) * 1000)
+
+
+def ai_batch(items, max_concurrency: int = 8,
+             provider_limits: Optional[Dict[str, int]] = None,
+             default_provider_limit: int = 4) -> List[BatchResult]:
+    """Run (model, prompt[, options]) items concurrently; results keep input order.
+
+    A failing item never fails the batch: its BatchResult carries the error.
+    """
+    limits = {**DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+    # A limit below 1 would leave items that can never be scheduled
+    if max_concurrency < 1 or default_provider_limit < 1:
+        raise ValueError("max_concurrency and default_provider_limit must be at least 1")
+    invalid = {provider: limit for provider, limit in limits.items() if limit < 1}
+    if invalid:
+        raise ValueError(f"provider limits must be at least 1: {invalid}")
+    pending = deque(
+        (index, item[0], item[1], item[2] if len(item) > 2 else {})
+        for index, item in enumerate(items)
+    )
+    results: List[Optional[BatchResult]] = [None] * len(pending)
+    in_flight = defaultdict(int)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        while pending or running:
+            # Start everything allowed by both limits; skip items whose provider is full
+            for _ in range(len(pending)):
+                if len(running) >= max_concurrency:
+                    break
+                index, model, prompt, options = pending.popleft()
+                provider = provider_for(model)
+                if in_flight[provider] >= limits.get(provider, default_provider_limit):
+                    pending.append((index, model, prompt, options))
+                    continue
+                in_flight[provider] += 1
+                running[pool.submit(_run, index, model, prompt, options)] = provider
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight[running.pop(future)] -= 1
+                result = future.result()
+                results[result.index] = result
+
+    return results
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Concurrent Batch Calls\n")
+
+    prompt = 'Explain the difference between REST and GraphQL APIs'
+    items = [(model, prompt) for model in
+             ['gpt-4', 'gpt-3.5-turbo', 'claude-3-5-sonnet-20241022', 'gemini-pro']]
+    items += [('gpt-3.5-turbo', f'Give me a one-line tip #{i} for writing Python', {'max_tokens': 60})
+              for i in range(1, 9)]
+
+    start = time.perf_counter()
+    results = ai_batch(items, max_concurrency=8, provider_limits={'openai': 4})
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    print("#   Model                       | Latency  | Cost")
+    print("-" * 60)
+    for r in results:
+        if r.ok:
+            print(f"{r.index:<3} {r.model:27} | {r.latency_ms:6.0f}ms | ${r.response.cost:.6f}")
+        else:
+            print(f"{r.index:<3} {r.model:27} | {r.latency_ms:6.0f}ms | Error: {str(r.error)[:30]}")
+
+    sequential_ms = sum(r.latency_ms for r in results)
+    print(f"\n⏱️  Wall time: {wall_ms:.0f}ms (sequential would be ~{sequential_ms:.0f}ms)")
+    print(f"✅ {sum(r.ok for r in results)}/{len(results)} succeeded\n")
+
+if __name__ == '__main__':
+    main()
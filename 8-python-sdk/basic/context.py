@@ -0,0 +1,226 @@
+"""
+Cost Katana Python SDK: Context-Window Management
+Keep long chat sessions inside a token budget: count tokens once per
+message, pin the system message, slide older turns out of the window and
+optionally compact them into a running summary. Input tokens per turn
+stay bounded, so a 100-turn session costs roughly linear instead of
+quadratic tokens.
+
+Run: python 8-python-sdk/basic/context.py             (100-turn token simulation)
+     python 8-python-sdk/basic/context.py --live      (real chat through the gateway)
+"""
+
+import os
+import re
+import sys
+from collections import deque
+from typing import Callable, List, Optional
+
+import requests
+
+GATEWAY_URL = "https://api.costkatana.com/api/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+MESSAGE_OVERHEAD_TOKENS = 4
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Cheap BPE-like estimate: ~1 token per short word/punctuation, longer words split"""
+    return sum(1 + len(piece) // 8 for piece in _PIECES.findall(text))
+
+
+class ContextWindow:
+    """Sliding token-budgeted message window with a pinned system message
+
+    `summarize(previous_summary, evicted_messages) -> str` is called once
+    evicted turns add up to `compact_after` tokens; the summary is kept as
+    a second system message right after the pinned one.
+    """
+
+    def __init__(self, budget: int = 3000, system_message: Optional[str] = None,
+                 summarize: Optional[Callable[[str, List[dict]], str]] = None,
+                 compact_after: int = 1500, max_summary_tokens: int = 300):
+        self.budget = budget
+        self.summarize = summarize
+        self.compact_after = compact_after
+        self.max_summary_tokens = max_summary_tokens
+        self.system = self._entry('system', system_message) if system_message else None
+        self.summary = None
+        self._turns = deque()     # (message, tokens)
+        self._tokens = 0          # tokens in self._turns
+        self._evicted = []
+        self._evicted_tokens = 0
+        self.stats = {'evicted': 0, 'compactions': 0, 'compaction_errors': 0}
+        self.last_error: Optional[Exception] = None
+
+    @staticmethod
+    def _entry(role, content):
+        return {'role': role, 'content': content}, count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def _fixed_tokens(self):
+        return (self.system[1] if self.system else 0) + (self.summary[1] if self.summary else 0)
+
+    def append(self, role: str, content: str):
+        entry = self._entry(role, content)
+        self._turns.append(entry)
+        self._tokens += entry[1]
+        self._fit()
+
+    def _fit(self):
+        # Always keep the newest message, even if it alone exceeds the budget
+        while len(self._turns) > 1 and self._fixed_tokens() + self._tokens > self.budget:
+            message, tokens = self._turns.popleft()
+            self._tokens -= tokens
+            self.stats['evicted'] += 1
+            if self.summarize:
+                self._evicted.append(message)
+                self._evicted_tokens += tokens
+        if self.summarize and self._evicted_tokens >= self.compact_after:
+            self._compact()
+
+    def _compact(self):
+        previous = self.summary[0]['content'] if self.summary else ''
+        try:
+            text = self.summarize(previous, self._evicted)
+        except Exception as e:
+            # Keep the evicted turns pending; the next append retries the compaction
+            self.stats['compaction_errors'] += 1
+            self.last_error = e
+            return
+        words = text.split()
+        while count_tokens(' '.join(words)) > self.max_summary_tokens:
+            words = words[:int(len(words) * 0.9)]
+        self.summary = self._entry('system', 'Summary of earlier conversation: ' + ' '.join(words))
+        self._evicted, self._evicted_tokens = [], 0
+        self.stats['compactions'] += 1
+        self._fit()
+
+    def checkpoint(self):
+        """Opaque state for rollback(), e.g. around a request that may fail"""
+        return (self.summary, deque(self._turns), self._tokens, list(self._evicted),
+                self._evicted_tokens, dict(self.stats))
+
+    def rollback(self, state):
+        (self.summary, self._turns, self._tokens, self._evicted,
+         self._evicted_tokens, self.stats) = state
+
+    def messages(self) -> List[dict]:
+        """What to send this turn: system, summary, then the most recent turns"""
+        fixed = [entry[0] for entry in (self.system, self.summary) if entry]
+        return fixed + [message for message, _ in self._turns]
+
+    @property
+    def tokens(self) -> int:
+        return self._fixed_tokens() + self._tokens
+
+
+def gateway_summarizer(model: str = 'gpt-3.5-turbo', max_tokens: int = 200):
+    """Summarize evicted turns with a cheap model through the gateway"""
+    def summarize(previous: str, evicted: List[dict]) -> str:
+        transcript = '\n'.join(f"{m['role']}: {m['content']}" for m in evicted)
+        prompt = (f"Existing summary:\n{previous or '(none)'}\n\nNew turns:\n{transcript}\n\n"
+                  "Update the summary in under 150 words, keeping facts, names and decisions.")
+        response = requests.post(
+            GATEWAY_URL,
+            json={'model': model, 'max_tokens': max_tokens,
+                  'messages': [{'role': 'user', 'content': prompt}]},
+            headers={'Authorization': f'Bearer {API_KEY}'},
+            timeout=60,
+        )
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content']
+    return summarize
+
+
+class ManagedChat:
+    """Like ck.chat, but each turn sends only the managed context window"""
+
+    def __init__(self, model: str, system_message: Optional[str] = None, budget: int = 3000,
+                 compact: bool = True, **options):
+        self.model = model
+        self.options = options
+        self.context = ContextWindow(
+            budget, system_message, summarize=gateway_summarizer() if compact else None
+        )
+        self.history: List[dict] = []   # full transcript, never sent as a whole
+        self.total_cost = 0.0
+        self.total_tokens = 0
+        self._session = requests.Session()
+
+    def send(self, message: str) -> str:
+        state = self.context.checkpoint()
+        self.context.append('user', message)
+        try:
+            response = self._session.post(
+                GATEWAY_URL,
+                json={'model': self.model, 'messages': self.context.messages(), **self.options},
+                headers={'Authorization': f'Bearer {API_KEY}'},
+                timeout=120,
+            )
+            response.raise_for_status()
+            data = response.json()
+            reply = data['choices'][0]['message']['content']
+        except Exception:
+            # No reply: drop the unanswered user turn so a retry starts clean
+            self.context.rollback(state)
+            raise
+        # Record the paid reply before the window update, which may call the summarizer
+        self.history.append({'role': 'user', 'content': message})
+        self.history.append({'role': 'assistant', 'content': reply})
+        self.total_cost += float(response.headers.get('X-Cost') or 0)
+        self.total_tokens += (data.get('usage') or {}).get('total_tokens', 0)
+        self.context.append('assistant', reply)
+        return reply
+
+
+def simulate(turns: int = 100, budget: int = 2000):
+    """Input tokens sent over a long session: full history vs managed window"""
+    def fake_summary(previous, evicted):
+        return (previous + ' ' + ' '.join(m['content'][:60] for m in evicted))[-900:]
+
+    system = 'You are a helpful AI assistant.'
+    full = [ContextWindow(10**9, system), 0]
+    managed = [ContextWindow(budget, system, summarize=fake_summary, compact_after=800), 0]
+    for turn in range(1, turns + 1):
+        question = f"Question {turn}: how does step {turn} of the deployment pipeline work?"
+        answer = f"Answer {turn}: " + "Step details with commands and caveats. " * 20
+        for state in (full, managed):
+            state[0].append('user', question)
+            state[1] += state[0].tokens          # input tokens for this request
+            state[0].append('assistant', answer)
+        if turn in (10, 25, 50, turns):
+            print(f"   Turn {turn:>3}: full history {full[1]:>9,} input tokens | "
+                  f"managed {managed[1]:>7,}")
+    print(f"\n   Saved {1 - managed[1] / full[1]:.0%} of input tokens "
+          f"({managed[0].stats['compactions']} compactions, "
+          f"{managed[0].stats['evicted']} messages slid out)")
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Context-Window Management\n")
+
+    if '--live' not in sys.argv:
+        print("📈 Cumulative input tokens over a 100-turn session (budget 2,000):\n")
+        simulate()
+        print("\n✅ Bounded context keeps long sessions linear!\n")
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    chat = ManagedChat('gpt-4', system_message='You are a helpful AI assistant.', budget=1500)
+    for question in ['What is Docker?', 'How do I install it?', 'Give me an example',
+                     'Explain volumes', 'And networking?', 'Summarize what we covered']:
+        reply = chat.send(question)
+        print(f"You: {question}\nAI: {reply[:100]}...")
+        print(f"   Context: {chat.context.tokens} tokens in "
+              f"{len(chat.context.messages())} messages\n")
+    print(f"💰 Total Session Cost: ${chat.total_cost:.6f}")
+    print(f"🎯 Total Tokens: {chat.total_tokens}")
+    print(f"📝 Transcript: {len(chat.history)} messages, "
+          f"{chat.context.stats['compactions']} compactions\n")
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ Cost Katana Python SDK: Model Comparison
 Compare costs across different AI models.
 """
 
-import cost_katana as ck
+from batch import ai_batch
 
 def main():
     print("\n🥷 Cost Katana Python SDK - Model Comparison\n")
@@ -15,12 +15,12 @@ def main():
     print("Model                      | Cost       | Tokens")
     print("-" * 55)
     
-    for model in models:
-        try:
-            response = ck.ai(model, prompt)
-            print(f"{model:25} | ${response.cost:.6f} | {response.tokens}")
-        except Exception as e:
-            print(f"{model:25} | Error: {str(e)[:20]}")
+    # All models at once: the comparison takes as long as the slowest model
+    for result in ai_batch([(model, prompt) for model in models]):
+        if result.ok:
+            print(f"{result.model:25} | ${result.response.cost:.6f} | {result.response.tokens}")
+        else:
+            print(f"{result.model:25} | Error: {str(result.error)[:20]}")
     
     print("\n💡 Tip: Use cheaper models for simple tasks!\n")
 
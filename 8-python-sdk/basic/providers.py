@@ -3,7 +3,7 @@ Cost Katana Python SDK: Multi-Provider Examples
 Demonstrates usage across different AI providers.
 """
 
-import cost_katana as ck
+from batch import ai_batch
 
 def main():
     print("\n🥷 Cost Katana Python SDK - Multi-Provider\n")
@@ -17,14 +17,14 @@ def main():
         ('nova-pro', 'AWS Bedrock'),
     ]
     
-    for model, provider_name in providers:
-        try:
-            print(f"\n{provider_name} ({model}):")
-            response = ck.ai(model, prompt)
-            print(f"  Response: {response.text[:80]}...")
-            print(f"  💰 Cost: ${response.cost:.6f}")
-        except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
+    results = ai_batch([(model, prompt) for model, _ in providers])
+    for (model, provider_name), result in zip(providers, results):
+        print(f"\n{provider_name} ({model}):")
+        if result.ok:
+            print(f"  Response: {result.response.text[:80]}...")
+            print(f"  💰 Cost: ${result.response.cost:.6f}")
+        else:
+            print(f"  ❌ Error: {str(result.error)}")
     
     print("\n✅ One SDK, all providers!\n")
 
@@ -0,0 +1,213 @@
+"""
+Cost Katana Python SDK: Token Streaming
+Print tokens as they arrive instead of waiting for the full completion,
+with time-to-first-token and tokens/sec. Cost and token counts are filled
+in when the stream ends.
+
+Run: python 8-python-sdk/basic/streaming.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Iterator, List, Optional
+
+import requests
+
+GATEWAY_URL = "https://api.costkatana.com/api/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+
+class StreamResponse:
+    """Iterate for text deltas; after the loop it looks like a ck.ai response"""
+
+    def __init__(self, model: str, messages: List[dict], session=None, **options):
+        self.model = model
+        self.text = ""
+        self.cost: Optional[float] = None
+        self.tokens = self.input_tokens = self.output_tokens = None
+        self.provider = None
+        self.cached = False
+        self.ttft_ms: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.tokens_per_sec: Optional[float] = None
+        self._chunks = 0
+        self._session = session or requests.Session()
+        self._messages = messages
+        self._options = options
+
+    def _request(self):
+        options = dict(self._options)
+        cache = options.pop('cache', False)
+        cortex = options.pop('cortex', False)
+        return self._session.post(
+            GATEWAY_URL,
+            json={
+                'model': self.model,
+                'messages': self._messages,
+                'stream': True,
+                'stream_options': {'include_usage': True},
+                **options,
+            },
+            headers={
+                'Authorization': f'Bearer {API_KEY}',
+                'Accept': 'text/event-stream',
+                'X-Enable-Cache': 'true' if cache else 'false',
+                'X-Enable-Cortex': 'true' if cortex else 'false',
+            },
+            stream=True,
+            timeout=(10, 300),
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        start = time.perf_counter()
+        first = None
+        parts = []
+        with self._request() as response:
+            response.raise_for_status()
+            self.provider = response.headers.get('X-Provider')
+            self.cached = (response.headers.get('X-Cache-Status') or '').lower() == 'hit'
+            if response.headers.get('X-Cost') is not None:
+                self.cost = float(response.headers['X-Cost'])
+
+            # text/event-stream is UTF-8 by spec; without a charset requests would use ISO-8859-1
+            response.encoding = 'utf-8'
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                payload = line[5:].strip()
+                if payload == '[DONE]':
+                    break
+                chunk = json.loads(payload)
+                self._finish_chunk(chunk)
+                for choice in chunk.get('choices') or ():
+                    delta = (choice.get('delta') or {}).get('content')
+                    if delta:
+                        if first is None:
+                            first = time.perf_counter()
+                            self.ttft_ms = (first - start) * 1000
+                        self._chunks += 1
+                        parts.append(delta)
+                        yield delta
+
+        end = time.perf_counter()
+        self.text = ''.join(parts)
+        self.latency = (end - start) * 1000
+        if self.output_tokens is None:
+            self.output_tokens = self._chunks  # one delta is roughly one token
+        if first is not None and end > first:
+            self.tokens_per_sec = self.output_tokens / (end - first)
+
+    def _finish_chunk(self, chunk):
+        """The final chunk carries usage (and cost, when the gateway reports it)"""
+        usage = chunk.get('usage')
+        if usage:
+            self.input_tokens = usage.get('prompt_tokens')
+            self.output_tokens = usage.get('completion_tokens')
+            self.tokens = usage.get('total_tokens')
+        if chunk.get('cost') is not None:
+            self.cost = float(chunk['cost'])
+
+    def __aiter__(self):
+        return _aiter(iter(self))
+
+
+async def _aiter(iterator):
+    """Drive the blocking iterator from a worker thread, one delta at a time"""
+    done = object()
+    try:
+        while True:
+            delta = await asyncio.to_thread(next, iterator, done)
+            if delta is done:
+                return
+            yield delta
+    finally:
+        # Consumer stopped early: close the generator so the HTTP stream is released
+        try:
+            iterator.close()
+        except ValueError:
+            pass  # cancelled mid-read; the worker thread still owns the generator
+
+
+def stream_ai(model: str, prompt: str, **options) -> StreamResponse:
+    """Streaming counterpart of ck.ai(model, prompt, **options)"""
+    return StreamResponse(model, [{'role': 'user', 'content': prompt}], **options)
+
+
+class StreamingChat:
+    """Streaming counterpart of ck.chat; history and totals update as turns finish"""
+
+    def __init__(self, model: str, system_message: Optional[str] = None, **options):
+        self.model = model
+        self.options = options
+        self.history: List[dict] = []
+        if system_message:
+            self.history.append({'role': 'system', 'content': system_message})
+        self.total_cost = 0.0
+        self.total_tokens = 0
+        self.last_response: Optional[StreamResponse] = None
+        self._session = requests.Session()
+
+    def send(self, message: str) -> Iterator[str]:
+        messages = self.history + [{'role': 'user', 'content': message}]
+        response = StreamResponse(self.model, messages, self._session, **self.options)
+        yield from response
+        # Only a finished stream joins the history; errors or an early stop leave it as it was
+        self.history.append({'role': 'user', 'content': message})
+        self.history.append({'role': 'assistant', 'content': response.text})
+        self.total_cost += response.cost or 0.0
+        self.total_tokens += response.tokens or 0
+        self.last_response = response
+
+
+def print_metrics(response: StreamResponse):
+    cost = f"${response.cost:.6f}" if response.cost is not None else "n/a"
+    print(f"\n\n⚡ Time to first token: {response.ttft_ms or 0:.0f}ms")
+    print(f"🚀 Throughput: {response.tokens_per_sec or 0:.1f} tokens/sec")
+    print(f"⏱️  Total: {response.latency:.0f}ms")
+    print(f"💰 Cost: {cost}  🎯 Tokens: {response.tokens}")
+
+
+async def async_demo():
+    response = stream_ai('gpt-3.5-turbo', 'List three uses of Kubernetes, one line each')
+    async for delta in response:
+        print(delta, end='', flush=True)
+    print_metrics(response)
+
+
+def main():
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    print("\n🥷 Cost Katana Python SDK - Token Streaming\n")
+
+    print("1. Long-form content, streamed:\n")
+    response = stream_ai(
+        'gpt-4',
+        'Write a 300-word introduction to building scalable microservices.',
+        max_tokens=600,
+    )
+    for delta in response:
+        sys.stdout.write(delta)
+        sys.stdout.flush()
+    print_metrics(response)
+
+    print("\n2. Streaming chat session:\n")
+    chat = StreamingChat('gpt-4', system_message='You are a helpful AI assistant.')
+    for question in ['What is Docker?', 'How do I install it?']:
+        print(f"You: {question}\nAI: ", end='')
+        for delta in chat.send(question):
+            print(delta, end='', flush=True)
+        print(f"\n   (TTFT {chat.last_response.ttft_ms or 0:.0f}ms)\n")
+    print(f"💰 Total Session Cost: ${chat.total_cost:.6f}")
+    print(f"🎯 Total Tokens: {chat.total_tokens}")
+
+    print("\n3. Async iterator:\n")
+    asyncio.run(async_demo())
+    print()
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ Automatic provider fallback for 99.99% availability.
 """
 
 import cost_katana as ck
+from health import PROVIDER_MODELS, HealthRouter
 
 def main():
     print("\n🥷 Cost Katana Python SDK - Auto-Failover\n")
@@ -21,6 +22,18 @@ def main():
     print(f"💰 Cost: ${response.cost:.6f}")
     print(f"🏢 Provider Used: {response.provider}")
     print(f"🔄 Failover Triggered: {response.failed_over}")
+
+    # Adaptive order: route by measured health instead of a fixed list. SDK
+    # failover is off for routed calls so each result is credited to the
+    # provider that actually answered.
+    ck.configure(failover=False)
+    router = HealthRouter(list(PROVIDER_MODELS))
+    provider, response = router.call(
+        lambda name: ck.ai(PROVIDER_MODELS[name], 'Test failover reliability')
+    )
+    ck.configure(failover=True, providers=router.ranked())
+    print(f"\n🩺 Health-routed to: {provider}")
+    print(f"📊 Provider order now: {router.ranked()}")
     print("\n✅ 99.99% availability with automatic failover!\n")
 
 if __name__ == '__main__':
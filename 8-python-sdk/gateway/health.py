@@ -0,0 +1,269 @@
+"""
+Cost Katana Python SDK: Health-Scored Provider Failover
+Route each request to the healthiest provider instead of a fixed order.
+EWMA latency and error rate are tracked per provider, and a circuit breaker
+trips on a failing provider and probes it half-open. A degraded primary
+then costs one instant rejection instead of a full timeout.
+
+Run: python 8-python-sdk/gateway/health.py             (simulated outage)
+     python 8-python-sdk/gateway/health.py --live      (real ck.ai calls)
+"""
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+# One representative model per provider, so ck.ai can be pointed at a provider
+PROVIDER_MODELS = {
+    'openai': 'gpt-4',
+    'anthropic': 'claude-3-5-sonnet-20241022',
+    'google': 'gemini-pro',
+}
+
+
+class ProviderHealth:
+    """EWMA latency/error rate plus circuit-breaker state for one provider"""
+
+    def __init__(self, name, alpha=0.2, initial_latency_ms=1000.0):
+        self.name = name
+        self.alpha = alpha
+        self.latency_ms = initial_latency_ms
+        self.error_rate = 0.0
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.probing = False
+        self.last_seen = None
+
+    def observe(self, latency_ms, ok, now):
+        self.last_seen = now
+        self.samples += 1
+        self.latency_ms += self.alpha * (latency_ms - self.latency_ms)
+        self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+
+    def score(self):
+        """Expected cost of trying this provider; lower is better"""
+        return self.latency_ms * (1 + 4 * self.error_rate)
+
+
+class HealthRouter:
+    """Pick providers by health score; skip open circuits without calling them
+
+    A circuit opens after `max_consecutive_failures` failures in a row, or
+    when the error-rate EWMA passes `error_threshold`. After `cooldown`
+    seconds one probe request is let through (half-open): success closes
+    the circuit, failure re-opens it with the cooldown doubled. A closed
+    provider that has not been used for `stale_after` seconds also gets a
+    probe, so a recovered primary wins its traffic back.
+    """
+
+    def __init__(self, providers, error_threshold=0.5, max_consecutive_failures=3,
+                 min_samples=5, cooldown=10.0, max_cooldown=300.0, stale_after=30.0,
+                 clock=time.monotonic, on_decision=None, history=200):
+        self.health = {name: ProviderHealth(name) for name in providers}
+        self.order = list(providers)
+        self.error_threshold = error_threshold
+        self.max_consecutive_failures = max_consecutive_failures
+        self.min_samples = min_samples
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.stale_after = stale_after
+        self.clock = clock
+        self.on_decision = on_decision
+        self.decisions = deque(maxlen=history)
+        self._pending = deque()
+        self._lock = threading.Lock()
+
+    def _log(self, event, provider, **details):
+        decision = {"at": self.clock(), "event": event, "provider": provider, **details}
+        self.decisions.append(decision)
+        if self.on_decision:
+            self._pending.append(decision)
+
+    def _notify(self):
+        """Run on_decision for queued decisions; never call with self._lock held"""
+        while self._pending:
+            try:
+                decision = self._pending.popleft()
+            except IndexError:
+                return
+            self.on_decision(decision)
+
+    def candidates(self):
+        """Providers to try, best first; claims the half-open probe slot if due"""
+        now = self.clock()
+        with self._lock:
+            ready, probe = [], None
+            for name in self.order:
+                health = self.health[name]
+                if health.state == OPEN and now - health.opened_at >= health.cooldown:
+                    health.state = HALF_OPEN
+                    self._log("half-open", name)
+                if health.state == HALF_OPEN:
+                    if not health.probing and probe is None:
+                        health.probing = True
+                        probe = name
+                elif health.state == CLOSED:
+                    ready.append(name)
+            ready.sort(key=lambda name: self.health[name].score())
+            if probe is None:
+                for name in ready[1:]:
+                    health = self.health[name]
+                    if not health.probing and health.last_seen is not None \
+                            and now - health.last_seen >= self.stale_after:
+                        health.probing = True
+                        probe = name
+                        ready.remove(name)
+                        break
+            # The probe is a real request; if it fails we fall over to the healthy ones
+            candidates = ([probe] if probe else []) + ready
+        self._notify()
+        return candidates
+
+    def record(self, name, latency_ms, ok):
+        with self._lock:
+            health = self.health[name]
+            health.observe(latency_ms, ok, self.clock())
+            probed, health.probing = health.probing, False
+            if probed and ok:
+                # A successful probe is fresh evidence: restart the averages from it
+                health.latency_ms, health.error_rate = latency_ms, 0.0
+                if health.state == HALF_OPEN:
+                    health.state = CLOSED
+                    health.cooldown = 0.0
+                    self._log("closed", name, latencyMs=round(latency_ms))
+            elif health.state == HALF_OPEN:
+                self._trip(health, "probe failed")
+            elif health.state == CLOSED and not ok and (
+                health.consecutive_failures >= self.max_consecutive_failures
+                or (health.samples >= self.min_samples
+                    and health.error_rate >= self.error_threshold)
+            ):
+                self._trip(health, f"{health.consecutive_failures} consecutive failures, "
+                                   f"error rate {health.error_rate:.0%}")
+        self._notify()
+
+    def _trip(self, health, reason):
+        health.state = OPEN
+        health.opened_at = self.clock()
+        health.cooldown = min(self.max_cooldown, (health.cooldown * 2) or self.base_cooldown)
+        self._log("open", health.name, reason=reason, cooldown=health.cooldown)
+
+    def call(self, fn):
+        """fn(provider) for the best provider, falling over on errors"""
+        errors = {}
+        candidates = self.candidates()
+        if not candidates:
+            self._log("rejected", None, reason="all circuits open")
+            self._notify()
+            raise RuntimeError("all providers are unavailable (circuits open)")
+        for name in candidates:
+            start = self.clock()
+            try:
+                result = fn(name)
+            except Exception as e:
+                self.record(name, (self.clock() - start) * 1000, ok=False)
+                errors[name] = e
+                self._log("failover", name, error=str(e)[:80])
+                self._notify()
+                continue
+            self.record(name, (self.clock() - start) * 1000, ok=True)
+            self._log("routed", name, latencyMs=round((self.clock() - start) * 1000))
+            self._notify()
+            return name, result
+        raise RuntimeError(f"all providers failed: {errors}")
+
+    def ranked(self):
+        """Current order by health, e.g. for PUT /failover/config providers"""
+        with self._lock:
+            return sorted(self.order, key=lambda name: (self.health[name].state != CLOSED,
+                                                        self.health[name].score()))
+
+    def status(self):
+        with self._lock:
+            return {
+                name: {"state": h.state, "latencyMs": round(h.latency_ms),
+                       "errorRate": round(h.error_rate, 3)}
+                for name, h in self.health.items()
+            }
+
+
+def simulate(requests_count=300, timeout_s=5.0):
+    """Simulated clock: OpenAI times out for requests 50-200; static order vs health routing"""
+    base_latency = {'openai': 0.8, 'anthropic': 1.0, 'google': 1.2}
+
+    def run(adaptive):
+        clock = [0.0]
+        router = HealthRouter(list(base_latency), cooldown=10.0, clock=lambda: clock[0],
+                              history=10 * requests_count)
+        total = 0.0
+        for i in range(requests_count):
+            def provider_call(name):
+                if name == 'openai' and 50 <= i < 200:
+                    clock[0] += timeout_s
+                    raise TimeoutError(f"{name} timed out after {timeout_s:.0f}s")
+                clock[0] += random.uniform(0.8, 1.2) * base_latency[name]
+                return "ok"
+
+            start = clock[0]
+            if adaptive:
+                router.call(provider_call)
+            else:
+                for name in base_latency:  # static order
+                    try:
+                        provider_call(name)
+                        break
+                    except TimeoutError:
+                        continue
+            total += clock[0] - start
+        return total / requests_count, router
+
+    random.seed(0)
+    static_avg, _ = run(False)
+    adaptive_avg, router = run(True)
+    print(f"⏱️  {requests_count} requests, primary times out ({timeout_s:.0f}s) for 150 of them")
+    print(f"   Static order:   {static_avg:.2f}s average latency")
+    print(f"   Health routing: {adaptive_avg:.2f}s average latency")
+    print("\n📝 Breaker decisions:")
+    for decision in router.decisions:
+        if decision["event"] in ("open", "half-open", "closed"):
+            details = {k: v for k, v in decision.items() if k not in ("at", "event", "provider")}
+            print(f"   t={decision['at']:7.1f}s {decision['provider']:<10} "
+                  f"{decision['event']:<9} {details or ''}")
+    print(f"\n📊 Final health: {router.status()}")
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Health-Scored Failover\n")
+
+    if "--live" not in sys.argv:
+        simulate()
+        print("\n✅ A degraded provider costs one fast rejection, not a timeout per request!\n")
+        return
+
+    import cost_katana as ck
+
+    # The router picks the provider; SDK-side failover would answer from another
+    # provider while the router credits the one it picked
+    ck.configure(failover=False)
+    router = HealthRouter(
+        list(PROVIDER_MODELS),
+        on_decision=lambda d: d["event"] != "routed" and print(f"   📝 {d}")
+    )
+    for i in range(5):
+        provider, response = router.call(
+            lambda name: ck.ai(PROVIDER_MODELS[name], 'Test failover reliability')
+        )
+        print(f"Request {i + 1}: {provider:<10} ${response.cost:.6f}")
+    print(f"\n📊 Health: {router.status()}")
+    print(f"🔄 Ranked order for the gateway failover config: {router.ranked()}\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+"""
+Cost Katana Python SDK: Retry Budgets, Retry-After and Hedged Requests
+A retry policy engine for gateway calls: decorrelated jittered backoff,
+a token-bucket retry budget per host so outages don't turn into retry
+storms, Retry-After awareness, and optional hedging (send a backup request
+once the primary is slower than p95, keep whichever answers first).
+
+Run: python 8-python-sdk/gateway/resilience.py            (benchmark against a local flaky server)
+     python 8-python-sdk/gateway/resilience.py --gateway  (one real gateway call)
+"""
+
+import email.utils
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+
+GATEWAY_URL = "https://api.costkatana.com/api/gateway/v1/chat/completions"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryBudget:
+    """Each request earns `ratio` of a retry; each retry spends one
+
+    Retries can never exceed ~ratio of traffic (plus `min_per_sec` so a
+    quiet client can still retry), which caps load during an outage.
+    """
+
+    def __init__(self, ratio=0.1, min_per_sec=1.0, max_tokens=10.0):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self._updated) * self.min_per_sec)
+        self._updated = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class LatencyTracker:
+    """Rolling window of successful latencies for the hedge threshold"""
+
+    def __init__(self, size=500, quantile=0.95, min_samples=20, default_ms=2000):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.default_ms = default_ms
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms):
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def threshold_ms(self):
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.default_ms
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))]
+
+
+class ResilientClient:
+    """POST with retries, per-host retry budgets and optional hedging"""
+
+    def __init__(self, max_retries=3, base_delay=0.05, max_delay=10.0, retry_ratio=0.1,
+                 hedge=False, hedge_ratio=0.05, hedge_after_ms=None, timeout=30,
+                 max_workers=64):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_ratio = retry_ratio
+        self.hedge = hedge
+        self.hedge_ratio = hedge_ratio
+        self.hedge_after_ms = hedge_after_ms
+        self.timeout = timeout
+        self._retry_budgets = defaultdict(lambda: RetryBudget(retry_ratio))
+        # Hedges are extra paid calls, so they get their own, smaller budget
+        self._hedge_budgets = defaultdict(lambda: RetryBudget(hedge_ratio, min_per_sec=0.1))
+        self._latency = defaultdict(LatencyTracker)
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers) if hedge else None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "attempts": 0, "retries": 0, "budgetExhausted": 0,
+                      "retryAfterHonored": 0, "retryAfterTooLong": 0, "hedges": 0, "hedgeWins": 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, url, kwargs):
+        self._count("attempts")
+        start = time.perf_counter()
+        response = self._session().post(url, timeout=self.timeout, **kwargs)
+        response.elapsed_ms = (time.perf_counter() - start) * 1000
+        return response
+
+    def _hedged(self, host, url, kwargs):
+        """Primary, then a backup after the p95 delay; first good answer wins"""
+        delay_ms = self.hedge_after_ms or self._latency[host].threshold_ms()
+        primary = self._pool.submit(self._send, url, kwargs)
+        done, _ = wait([primary], timeout=delay_ms / 1000)
+        if done or not self._hedge_budgets[host].withdraw():
+            return primary.result()
+
+        self._count("hedges")
+        backup = self._pool.submit(self._send, url, kwargs)
+        pending = {primary, backup}
+        winner = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and future.result().status_code < 500:
+                    winner = future
+                    break
+            if winner is not None:
+                break
+        if winner is None:
+            return primary.result()  # both failed: surface the primary's outcome
+        if winner is backup:
+            self._count("hedgeWins")
+        # requests cannot abort an in-flight call, so the loser is abandoned and
+        # its connection closed as soon as it returns
+        for future in pending | {primary, backup} - {winner}:
+            future.add_done_callback(
+                lambda f: f.exception() is None and f.result().close()
+            )
+        return winner.result()
+
+    def _retry_delay(self, response, previous):
+        """(delay, previous); delay is None when Retry-After is longer than max_delay"""
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) \
+            if response is not None else None
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                # Retrying sooner would break the server's rule; hand the 429/503 back
+                self._count("retryAfterTooLong")
+                return None, previous
+            self._count("retryAfterHonored")
+            return retry_after, previous
+        # Decorrelated jitter: each sleep is random in [base, 3 x previous sleep]
+        delay = min(self.max_delay, random.uniform(self.base_delay, previous * 3))
+        return delay, delay
+
+    def post(self, url, **kwargs):
+        host = urlparse(url).netloc
+        budget = self._retry_budgets[host]
+        budget.deposit()
+        if self.hedge:
+            self._hedge_budgets[host].deposit()
+        self._count("requests")
+        previous = self.base_delay
+
+        for attempt in range(self.max_retries + 1):
+            response, error = None, None
+            try:
+                response = (self._hedged(host, url, kwargs) if self.hedge
+                            else self._send(url, kwargs))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            if response is not None and response.status_code not in RETRYABLE_STATUS:
+                if response.ok:
+                    self._latency[host].record(response.elapsed_ms)
+                return response
+            if attempt == self.max_retries:
+                break
+            delay, previous = self._retry_delay(response, previous)
+            if delay is None:
+                break
+            if not budget.withdraw():
+                self._count("budgetExhausted")
+                break
+            self._count("retries")
+            time.sleep(delay)
+
+        if error is not None:
+            raise error
+        return response
+
+
+# Local flaky stand-in for the gateway: heavy latency tail plus 503/429s
+class _FlakyHandler(BaseHTTPRequestHandler):
+    served = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with _FlakyHandler.lock:
+            _FlakyHandler.served += 1
+        roll = random.random()
+        if roll < 0.04:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if roll < 0.06:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        tail = random.random()
+        time.sleep(1.0 if tail < 0.03 else 0.25 if tail < 0.10 else random.uniform(0.01, 0.03))
+        body = b'{"choices":[{"message":{"content":"ok"}}]}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def benchmark(requests_count=600, concurrency=8):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+
+    scenarios = [
+        ("Retries only", ResilientClient(max_retries=3)),
+        ("Retries + hedging", ResilientClient(max_retries=3, hedge=True, hedge_ratio=0.1)),
+    ]
+    print(f"⏱️  {requests_count} requests, {concurrency} concurrent, "
+          f"6% errors, 10% slow (3% at 1s)\n")
+    print(f"{'Scenario':<20} | {'p50':>7} | {'p95':>7} | {'p99':>7} | "
+          f"{'failed':>6} | server calls")
+    print("-" * 72)
+    for name, client in scenarios:
+        random.seed(1)
+        _FlakyHandler.served = 0
+        latencies, failed = [], 0
+
+        def call(_):
+            start = time.perf_counter()
+            response = client.post(url, json={"model": "gpt-4", "messages": []})
+            return (time.perf_counter() - start) * 1000, response.ok
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for latency, ok in pool.map(call, range(requests_count)):
+                latencies.append(latency)
+                failed += not ok
+        time.sleep(1.1)  # let abandoned hedge losers finish before counting
+        print(f"{name:<20} | {_percentile(latencies, 0.50):5.0f}ms | "
+              f"{_percentile(latencies, 0.95):5.0f}ms | {_percentile(latencies, 0.99):5.0f}ms | "
+              f"{failed:>6} | {_FlakyHandler.served} "
+              f"(hedges {client.stats['hedges']}, retries {client.stats['retries']})")
+    server.shutdown()
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Retry Budgets & Hedged Requests\n")
+
+    if "--gateway" not in sys.argv:
+        benchmark()
+        print("\n✅ Hedging trims the tail; the retry budget caps extra load.\n")
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    client = ResilientClient(max_retries=3, hedge=True)
+    response = client.post(
+        GATEWAY_URL,
+        json={"model": "gpt-4", "messages": [{"role": "user", "content": "Test retry logic"}]},
+        headers={"Authorization": f"Bearer {API_KEY}"}
+    )
+    response.raise_for_status()
+    print(f"Response: {response.json()['choices'][0]['message']['content'][:100]}...")
+    print(f"💰 Cost: ${float(response.headers.get('X-Cost') or 0):.6f}")
+    print(f"🔄 Stats: {client.stats}\n")
+
+if __name__ == '__main__':
+    main()
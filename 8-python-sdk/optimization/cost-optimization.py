@@ -4,6 +4,8 @@ Practical examples of choosing the right model for the task.
 """
 
 import cost_katana as ck
+from estimator import TokenEstimator, input_tokens_of
+from router import ComplexityRouter
 
 def main():
     print("\n🥷 Cost Katana Python SDK - Cost Optimization\n")
@@ -20,26 +22,31 @@ def main():
         'premium': 'gpt-4'
     }
     
-    print("Task Complexity vs Model Selection:\n")
-    
-    # Simple task - use budget model
-    print("1. Simple Task:")
-    r1 = ck.ai(models['budget'], prompts['simple'])
-    print(f"   Model: {models['budget']}")
-    print(f"   Cost: ${r1.cost:.6f}\n")
-    
-    # Medium task - use balanced model
-    print("2. Medium Task:")
-    r2 = ck.ai(models['balanced'], prompts['medium'])
-    print(f"   Model: {models['balanced']}")
-    print(f"   Cost: ${r2.cost:.6f}\n")
-    
-    # Complex task - use premium model
-    print("3. Complex Task:")
-    r3 = ck.ai(models['premium'], prompts['complex'])
-    print(f"   Model: {models['premium']}")
-    print(f"   Cost: ${r3.cost:.6f}\n")
+    estimator = TokenEstimator()
+
+    print("Pre-flight estimates (no API calls):\n")
+    for tier, model in models.items():
+        costs = estimator.estimate_cost(prompts.values(), model)
+        print(f"   {tier:<9} {model:27} " + "  ".join(f"${c:.6f}" for c in costs))
+    print()
+
+    print("Task Complexity vs Model Selection (routed locally):\n")
+    router = ComplexityRouter()
+
+    for i, (label, prompt) in enumerate(prompts.items(), 1):
+        route = router.route(prompt)
+        estimate = estimator.estimate_cost([prompt], route.model)[0]
+        response = ck.ai(route.model, prompt)
+        estimator.observe(route.model, prompt, input_tokens_of(response))
+        print(f"{i}. {label.title()} Task:")
+        print(f"   Complexity: {route.score:.2f} -> {route.tier}")
+        print(f"   Model: {route.model}")
+        print(f"   Cost: ${response.cost:.6f} (estimated ${estimate:.6f})\n")
     
+    for family, stats in estimator.calibration().items():
+        print(f"📐 {family} token estimate error: {stats['mape']:.1f}%")
+    print()
+
     print("💡 Optimization Tips:")
     print("   • Use gpt-3.5-turbo for simple tasks (10x cheaper)")
     print("   • Use claude-3-haiku for speed (fastest + cheap)")
@@ -0,0 +1,191 @@
+"""
+Cost Katana Python SDK: Local Token & Cost Estimator
+Estimate tokens and cost before sending, so you can pick a model and
+enforce a budget up front. Estimates come from a few string counts per
+prompt (C-speed str methods, no tokenizer), are batched over many prompts
+at once, and self-calibrate against the actual token counts ck.ai reports.
+
+Run: python 8-python-sdk/optimization/estimator.py            (offline benchmark)
+     python 8-python-sdk/optimization/estimator.py --live     (calibrate against ck.ai)
+"""
+
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# USD per 1M tokens (input, output). List prices; override with your contract rates.
+PRICING = {
+    'gpt-4': (30.00, 60.00),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'claude-3-5-sonnet-20241022': (3.00, 15.00),
+    'claude-3-haiku-20240307': (0.25, 1.25),
+    'gemini-pro': (0.50, 1.50),
+    'gemini-1.5-flash': (0.075, 0.30),
+    'nova-pro': (0.80, 3.20),
+}
+
+# Characters per token by tokenizer family, for English prose
+CHARS_PER_TOKEN = {'openai': 4.0, 'anthropic': 3.6, 'google': 4.2, 'bedrock': 4.0}
+
+FAMILY_PREFIXES = (('gpt-', 'openai'), ('o1', 'openai'), ('claude', 'anthropic'),
+                   ('gemini', 'google'), ('nova', 'bedrock'), ('anthropic.', 'anthropic'))
+
+MESSAGE_OVERHEAD_TOKENS = 7
+
+
+def family_for(model: str) -> str:
+    for prefix, family in FAMILY_PREFIXES:
+        if model.startswith(prefix):
+            return family
+    return 'openai'
+
+
+def input_tokens_of(response) -> Optional[int]:
+    """Actual input tokens from a ck.ai response, or None when it doesn't report them
+
+    Total tokens include the completion, so they are never used as a stand-in.
+    """
+    tokens = getattr(response, 'input_tokens', None)
+    if tokens is None:
+        tokens = (getattr(response, 'usage', None) or {}).get('prompt_tokens')
+    return tokens if isinstance(tokens, int) and tokens > 0 else None
+
+
+class TokenEstimator:
+    """Per-family token estimates with a learned correction factor
+
+    tokens ~= chars / chars_per_token, plus extra for whitespace runs,
+    newlines and digits, which tokenizers split more finely than prose.
+    """
+
+    def __init__(self, pricing: Dict[str, Tuple[float, float]] = PRICING):
+        self.pricing = dict(pricing)
+        self.scale = dict.fromkeys(CHARS_PER_TOKEN, 1.0)   # calibration per family
+        self._errors = {family: [] for family in CHARS_PER_TOKEN}
+
+    def estimate_tokens(self, prompts: Iterable[str], model: str) -> List[int]:
+        family = family_for(model)
+        per_char = self.scale[family] / CHARS_PER_TOKEN[family]
+        return [
+            int(len(p) * per_char + (p.count('\n') + p.count('  ')) * 0.5
+                + sum(map(p.count, '0123456789')) * 0.25) + MESSAGE_OVERHEAD_TOKENS
+            for p in prompts
+        ]
+
+    def estimate_cost(self, prompts: Iterable[str], model: str,
+                      output_tokens: int = 300) -> List[float]:
+        """Expected USD per prompt, assuming `output_tokens` of completion"""
+        if model not in self.pricing:
+            raise ValueError(f"no pricing for model '{model}'; add it to PRICING "
+                             f"or pass pricing= to TokenEstimator")
+        input_price, output_price = self.pricing[model]
+        output_cost = output_tokens * output_price / 1e6
+        return [tokens * input_price / 1e6 + output_cost
+                for tokens in self.estimate_tokens(prompts, model)]
+
+    def cheapest(self, prompt: str, models: Iterable[str], max_cost: Optional[float] = None,
+                 output_tokens: int = 300) -> Optional[Tuple[str, float]]:
+        """(model, estimated cost) for the cheapest model under `max_cost`"""
+        options = sorted(
+            (self.estimate_cost([prompt], model, output_tokens)[0], model) for model in models
+        )
+        for cost, model in options:
+            if max_cost is None or cost <= max_cost:
+                return model, cost
+        return None
+
+    def within_budget(self, prompts: List[str], model: str, budget: float,
+                      output_tokens: int = 300) -> Tuple[List[str], float]:
+        """Longest prefix of `prompts` whose estimated total stays under `budget`"""
+        total = 0.0
+        for i, cost in enumerate(self.estimate_cost(prompts, model, output_tokens)):
+            if total + cost > budget:
+                return prompts[:i], total
+            total += cost
+        return prompts, total
+
+    def observe(self, model: str, prompt: str, actual_input_tokens: Optional[int],
+                alpha: float = 0.1):
+        """Record an actual count (see input_tokens_of) and nudge the scale; None is skipped"""
+        if not actual_input_tokens or actual_input_tokens <= 0:
+            return
+        family = family_for(model)
+        estimated = self.estimate_tokens([prompt], model)[0]
+        self._errors[family].append((estimated - actual_input_tokens) / actual_input_tokens)
+        ratio = actual_input_tokens / max(estimated, 1)
+        self.scale[family] *= 1 + alpha * (ratio - 1)
+
+    def calibration(self) -> Dict[str, Dict[str, float]]:
+        """Mean absolute % error and bias per family, over the observed calls"""
+        report = {}
+        for family, errors in self._errors.items():
+            if errors:
+                report[family] = {
+                    'samples': len(errors),
+                    'mape': sum(abs(e) for e in errors) / len(errors) * 100,
+                    'bias': sum(errors) / len(errors) * 100,
+                    'scale': round(self.scale[family], 3),
+                }
+        return report
+
+
+def benchmark(count: int = 100_000):
+    estimator = TokenEstimator()
+    samples = [
+        'What is 2+2?',
+        'Explain how Docker works',
+        'Design a microservices architecture for e-commerce with payments, '
+        'inventory, search and recommendations. Include data flows.',
+        'def add(a, b):\n    return a + b\n\nprint(add(1, 2))',
+    ]
+    prompts = [samples[i % len(samples)] + f' #{i}' for i in range(count)]
+
+    start = time.perf_counter()
+    costs = estimator.estimate_cost(prompts, 'gpt-4')
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {count:,} prompts estimated in {elapsed * 1000:.0f}ms "
+          f"({count / elapsed:,.0f} prompts/sec)")
+    print(f"   Estimated gpt-4 spend: ${sum(costs):,.2f} (300 output tokens each)")
+
+    kept, total = estimator.within_budget(prompts, 'gpt-3.5-turbo', budget=5.0)
+    print(f"   $5 budget on gpt-3.5-turbo covers {len(kept):,} prompts (${total:.2f})")
+    for prompt in samples[:3]:
+        model, cost = estimator.cheapest(prompt, PRICING)
+        print(f"   Cheapest for {prompt[:30]!r:34} {model} (${cost:.6f})")
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Local Token & Cost Estimator\n")
+
+    if '--live' not in sys.argv:
+        benchmark()
+        print("\n✅ Pre-flight estimates without a network call!\n")
+        return
+
+    import cost_katana as ck
+
+    estimator = TokenEstimator()
+    prompts = ['What is 2+2?', 'Explain how Docker works',
+               'Design a microservices architecture for e-commerce']
+    print("Model                      | Est. cost  | Actual     | Est. tokens | Actual")
+    print("-" * 80)
+    for model in ['gpt-3.5-turbo', 'claude-3-5-sonnet-20241022', 'gemini-pro']:
+        for prompt in prompts:
+            estimated_cost = estimator.estimate_cost([prompt], model)[0]
+            estimated_tokens = estimator.estimate_tokens([prompt], model)[0]
+            response = ck.ai(model, prompt)
+            actual_input = input_tokens_of(response)
+            estimator.observe(model, prompt, actual_input)
+            print(f"{model:26} | ${estimated_cost:.6f} | ${response.cost:.6f} | "
+                  f"{estimated_tokens:>11} | {actual_input or 'n/a'}")
+
+    print("\n📐 Calibration (input tokens):")
+    for family, stats in estimator.calibration().items():
+        print(f"   {family:<10} MAPE {stats['mape']:.1f}%  bias {stats['bias']:+.1f}%  "
+              f"scale {stats['scale']}  ({stats['samples']} calls)")
+    print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,448 @@
+"""
+Cost Katana Python SDK: Local Complexity Router
+Pick budget, balanced or premium models per prompt, in-process. A prompt
+gets a complexity score from cheap features (length, structure, keywords,
+code), and the score maps to tiers from the routing config. The config is
+fetched from /model-routing/config, cached, and refreshed in the
+background, so a routing decision never waits on the network; it costs
+on the order of 15-25µs of CPU.
+
+Run: python 8-python-sdk/optimization/router.py                  (evaluate on the dev and held-out corpora)
+     python 8-python-sdk/optimization/router.py --eval file.jsonl (your corpus: {"prompt", "label"} per line)
+     python 8-python-sdk/optimization/router.py --live            (route real ck.ai calls)
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from estimator import TokenEstimator
+
+API_BASE = "https://api.costkatana.com/api"
+API_KEY = os.getenv("COST_KATANA_API_KEY")
+
+# Tiers in ascending order; a prompt goes to the first tier whose maxScore covers it
+DEFAULT_CONFIG = {
+    'tiers': [
+        {'name': 'budget', 'model': 'gpt-3.5-turbo', 'maxScore': 0.15},
+        {'name': 'balanced', 'model': 'claude-3-5-sonnet-20241022', 'maxScore': 0.45},
+        {'name': 'premium', 'model': 'gpt-4', 'maxScore': 1.00},
+    ]
+}
+
+# One pass over the text; each match fills the group for its keyword class.
+# The lists are generic task cues, not phrases from the evaluation corpora.
+KEYWORDS = re.compile(
+    r'\b(?:'
+    # reasoning / engineering work
+    r'(design\w*|architect\w*|analy[sz]\w*|trade-?offs?|optimi[sz]\w*|prove|proofs?|deriv\w*|'
+    r'debug\w*|refactor\w*|strateg\w*|evaluat\w*|implement\w*|migrat\w*|scalab\w*|'
+    r'distributed|concurren\w*|algorithm\w*|complexity|critique|formal\w*|rigorous\w*|'
+    r'threat model\w*|benchmark\w*|plan)'
+    # open-ended writing and explanation
+    r'|(explain\w*|describe|discuss|elaborate|in depth|in detail|detailed|thorough\w*|'
+    r'comprehensive|essay|overview|summari[sz]e|write|draft|rewrite|compar\w*|'
+    r'contrast|why|how (?:does|do|can|should|would)|outline)'
+    # closed-form lookups and mechanical transforms
+    r'|(translate|convert|spell|how many|how much|yes or no|true or false|'
+    r'who (?:is|was|wrote|invented|founded)|when (?:did|was|is)|where (?:is|was)|'
+    r'what is the \w+ (?:of|in)|define)'
+    r')\b'
+)
+ARITHMETIC = re.compile(r'\d\s*[-+*/×^]\s*\d')
+CODE_MARKERS = ('```', 'def ', 'class ', 'function ', 'return ', '=>', '{', ';\n',
+                'import ', 'SELECT ', '#include', 'Traceback')
+
+SCAN_CHARS = 2000    # keyword/code scan is bounded; length is counted in full
+SHORT_CHARS = 200    # closed-form cues only lower the score for short prompts
+
+
+class Features(NamedTuple):
+    chars: int
+    lines: int
+    list_items: int
+    questions: int
+    complex_words: int
+    open_words: int
+    closed_words: int
+    arithmetic: bool
+    code: bool
+
+
+def extract_features(prompt: str) -> Features:
+    head = prompt[:SCAN_CHARS]
+    complex_words = open_words = closed_words = 0
+    for hard, open_ended, _ in KEYWORDS.findall(head.lower()):
+        if hard:
+            complex_words += 1
+        elif open_ended:
+            open_words += 1
+        else:
+            closed_words += 1
+    return Features(
+        chars=len(prompt),
+        lines=prompt.count('\n') + 1,
+        list_items=head.count('\n-') + head.count('\n*') + head.count('\n1.') + head.count('\n2.'),
+        questions=head.count('?'),
+        complex_words=complex_words,
+        open_words=open_words,
+        closed_words=closed_words,
+        arithmetic=ARITHMETIC.search(head) is not None,
+        code=any(marker in head for marker in CODE_MARKERS),
+    )
+
+
+def complexity_score(prompt: str) -> float:
+    """0.0 (closed-form lookup) .. 1.0 (long, multi-part, technical task)
+
+    With no cues at all a prompt lands mid-range: an unfamiliar question
+    goes to the balanced tier, not the budget one.
+    """
+    f = extract_features(prompt)
+    score = (
+        0.20
+        + 0.10 * min(1.0, math.log(f.chars + 1, 4000))   # saturates around 4k chars
+        + 0.03 * min(f.lines - 1, 5)
+        + 0.04 * min(f.list_items, 4)
+        + 0.05 * min(max(f.questions - 1, 0), 3)
+        + 0.22 * min(f.complex_words, 3)
+        + 0.06 * min(f.open_words, 3)
+        + (0.15 if f.code else 0.0)
+    )
+    if (f.closed_words or f.arithmetic) and not f.complex_words and f.chars < SHORT_CHARS:
+        score -= 0.25
+    return min(1.0, max(0.0, score))
+
+
+class Route(NamedTuple):
+    model: str
+    tier: str
+    score: float
+
+
+class _Snapshot(NamedTuple):
+    bounds: Tuple[float, ...]
+    tiers: Tuple[str, ...]
+    models: Tuple[str, ...]
+    version: Optional[str]
+
+
+def _snapshot(config: dict) -> _Snapshot:
+    tiers = sorted(config['tiers'], key=lambda tier: tier['maxScore'])
+    if not tiers:
+        raise ValueError("routing config has no tiers")
+    bounds = [float(tier['maxScore']) for tier in tiers]
+    bounds[-1] = max(bounds[-1], 1.0)   # every score must land somewhere
+    return _Snapshot(tuple(bounds), tuple(t['name'] for t in tiers),
+                     tuple(t['model'] for t in tiers), config.get('version'))
+
+
+def fetch_routing_config() -> dict:
+    """GET /model-routing/config; the 'data' payload, like routing.py:get_routing_config"""
+    response = requests.get(f"{API_BASE}/model-routing/config",
+                            headers={'Authorization': f'Bearer {API_KEY}'}, timeout=10)
+    response.raise_for_status()
+    return response.json()['data']
+
+
+class CachedRoutingConfig:
+    """Last good routing config, refreshed off the request path
+
+    Reads are a single attribute load of an immutable snapshot. A daemon
+    thread refetches every `refresh_interval` seconds; on failure, or when
+    the server config has no `tiers`, the previous snapshot stays in use.
+    """
+
+    def __init__(self, fetch: Callable[[], dict] = fetch_routing_config,
+                 refresh_interval: float = 60.0, initial: dict = DEFAULT_CONFIG):
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.snapshot = _snapshot(initial)
+        self.loaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.stats = {'refreshes': 0, 'changes': 0, 'errors': 0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Fetch once; True if the tiers changed"""
+        try:
+            data = self.fetch()
+            if not data or not data.get('tiers'):
+                raise ValueError("server config has no 'tiers'; keeping local tiers")
+            snapshot = _snapshot(data)
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.last_error = str(e)
+            return False
+        self.stats['refreshes'] += 1
+        self.loaded_at = time.time()
+        self.last_error = None
+        changed = snapshot[:3] != self.snapshot[:3]
+        if changed:
+            self.stats['changes'] += 1
+        self.snapshot = snapshot
+        return changed
+
+    def start(self):
+        if self._thread is None:
+            self.refresh()
+            self._thread = threading.Thread(target=self._run, name='routing-config',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+class ComplexityRouter:
+    """route(prompt) -> Route(model, tier, score); no I/O on the hot path"""
+
+    def __init__(self, config: Optional[CachedRoutingConfig] = None,
+                 score: Callable[[str], float] = complexity_score):
+        self.config = config or CachedRoutingConfig(fetch=lambda: DEFAULT_CONFIG)
+        self.score = score
+        self.counts: Dict[str, int] = {}
+
+    def route(self, prompt: str) -> Route:
+        snapshot = self.config.snapshot
+        score = self.score(prompt)
+        i = min(bisect_left(snapshot.bounds, score), len(snapshot.bounds) - 1)
+        tier = snapshot.tiers[i]
+        self.counts[tier] = self.counts.get(tier, 0) + 1
+        return Route(snapshot.models[i], tier, score)
+
+
+# Labeled corpora: (prompt, tier a careful human would pick). Weights and
+# thresholds were tuned on DEV_CORPUS only; HOLDOUT_CORPUS was written
+# separately and is never tuned against, so its numbers are the ones to trust.
+DEV_CORPUS = [
+    ('What is 2+2?', 'budget'),
+    ('What is the capital of France?', 'budget'),
+    ('Translate "good morning" to Spanish', 'budget'),
+    ('Define latency', 'budget'),
+    ('How many days are in a leap year?', 'budget'),
+    ('List five fruits', 'budget'),
+    ('Convert 100 Fahrenheit to Celsius', 'budget'),
+    ('Who is the author of Dune?', 'budget'),
+    ('Spell "necessary" backwards', 'budget'),
+    ('Name three primary colors', 'budget'),
+    ('Is Python dynamically typed? Yes or no', 'budget'),
+    ('Give me a synonym for happy', 'budget'),
+    ('Summarize this sentence: the meeting moved to Friday.', 'budget'),
+    ('Explain how Docker works', 'balanced'),
+    ('Write a short product description for a steel water bottle', 'balanced'),
+    ('Summarize the key points of the following release notes:\n- faster startup\n'
+     '- new dark mode\n- fixed login bug', 'balanced'),
+    ('Explain the difference between TCP and UDP with examples', 'balanced'),
+    ('Write a polite email declining a meeting invitation and proposing next week', 'balanced'),
+    ('Compare Python and Go for writing CLI tools', 'balanced'),
+    ('What are the pros and cons of remote work?', 'balanced'),
+    ('Explain why the sky is blue to a 10-year-old', 'balanced'),
+    ('Write a SQL query that returns the top 5 customers by revenue', 'balanced'),
+    ('Fix the typo in this function:\ndef add(a, b):\n    retrun a + b', 'balanced'),
+    ('Outline a blog post about caching LLM responses', 'balanced'),
+    ('Explain how a hash map handles collisions', 'balanced'),
+    ('Design a microservices architecture for e-commerce', 'premium'),
+    ('Design a distributed rate limiter that scales to 1M requests/sec and explain '
+     'the trade-offs between token bucket and sliding window approaches', 'premium'),
+    ('Refactor this class to be thread-safe and explain the concurrency issues:\n'
+     '```python\nclass Counter:\n    def __init__(self):\n        self.n = 0\n'
+     '    def inc(self):\n        self.n += 1\n```', 'premium'),
+    ('Prove that the square root of 2 is irrational, step by step', 'premium'),
+    ('Analyze the security implications of storing JWTs in localStorage versus '
+     'httpOnly cookies, and recommend a strategy for a banking app', 'premium'),
+    ('Debug this: my Kubernetes pods restart every 5 minutes with exit code 137. '
+     'What could cause it? How do I confirm? What should I change?', 'premium'),
+    ('Plan a migration from a monolithic Rails app to services:\n1. identify seams\n'
+     '2. data ownership\n3. rollout\nCover risks and a timeline.', 'premium'),
+    ('Implement an LRU cache in Rust with O(1) operations and explain the '
+     'ownership model you used', 'premium'),
+    ('Evaluate three strategies for multi-region database replication and compare '
+     'consistency, latency and cost', 'premium'),
+    ('Derive the time complexity of quicksort in the average case', 'premium'),
+    ('Optimize this query and explain the plan:\nSELECT * FROM orders o JOIN users u '
+     'ON o.user_id = u.id WHERE u.country = \'DE\' ORDER BY o.created_at DESC;', 'premium'),
+]
+
+HOLDOUT_CORPUS = [
+    ('Who wrote Pride and Prejudice?', 'budget'),
+    ('What is the boiling point of water in Fahrenheit?', 'budget'),
+    ('Translate "thank you very much" into German', 'budget'),
+    ('How many ounces are in a pound?', 'budget'),
+    ('Convert 5 kilometers to miles', 'budget'),
+    ('When did the Berlin Wall fall?', 'budget'),
+    ('What is 15% of 80?', 'budget'),
+    ('Is a tomato a fruit? Answer yes or no', 'budget'),
+    ('Where is Mount Kilimanjaro?', 'budget'),
+    ('Alphabetize: pear, apple, mango', 'budget'),
+    ('What is a monad?', 'balanced'),
+    ('Tell me about the French Revolution in depth, including its causes and legacy',
+     'balanced'),
+    ('Write a haiku about autumn rain', 'balanced'),
+    ('Describe the water cycle for a middle-school science class', 'balanced'),
+    ('Summarize the plot of Hamlet in one paragraph', 'balanced'),
+    ('How does HTTPS keep traffic private?', 'balanced'),
+    ('Draft a friendly reminder to a client about an overdue invoice', 'balanced'),
+    ('What should I consider when adopting a rescue dog?', 'balanced'),
+    ('Explain what a closure is in JavaScript with a small example', 'balanced'),
+    ('Rewrite this sentence to sound more formal: hey, can u send the report asap',
+     'balanced'),
+    ('Give me three ideas for a team-building activity', 'balanced'),
+    ('Design a schema and indexing strategy for a multi-tenant SaaS analytics database '
+     'with 10TB of events', 'premium'),
+    ('Analyze the failure modes of two-phase commit and propose an alternative for a '
+     'payment system', 'premium'),
+    ('Write a proof that there are infinitely many primes, then extend it to primes of '
+     'the form 4k+3', 'premium'),
+    ('Here is a stack trace from our Go service. Find the root cause and propose a fix:\n'
+     'panic: runtime error: invalid memory address or nil pointer dereference\n'
+     'goroutine 12 [running]:\nmain.(*Cache).Get(...)\n\t/app/cache.go:42', 'premium'),
+    ('Implement a thread-safe bounded queue in Java and explain how you avoid deadlocks',
+     'premium'),
+    ('Compare event sourcing and CRUD for an inventory system, with trade-offs on '
+     'consistency, auditability and operational cost', 'premium'),
+    ('Optimize this Python function for speed and explain each change:\n```python\n'
+     'def dedupe(xs):\n    out = []\n    for x in xs:\n        if x not in out:\n'
+     '            out.append(x)\n    return out\n```', 'premium'),
+    ('Evaluate whether we should move internal services from REST to gRPC; cover '
+     'latency, tooling and team skills', 'premium'),
+    ('Create a 12-week study plan for the AWS Solutions Architect exam, with weekly '
+     'goals and a practice-exam schedule', 'premium'),
+]
+
+
+def evaluate(router: ComplexityRouter, corpus: List[Tuple[str, str]],
+             estimator: Optional[TokenEstimator] = None) -> dict:
+    """Cost vs always-premium and vs the labels, plus quality proxies
+
+    Under-routed prompts (cheaper tier than the label) are the quality risk;
+    over-routed prompts are wasted spend. Labels must name tiers of the
+    current config; costs are None when a tier's model has no price.
+    """
+    estimator = estimator or TokenEstimator()
+    snapshot = router.config.snapshot   # one snapshot, so a refresh can't rename tiers mid-run
+    rank = {tier: i for i, tier in enumerate(snapshot.tiers)}   # labels are tier names
+    unknown = sorted({label for _, label in corpus} - rank.keys())
+    if unknown:
+        raise ValueError(f"labels {unknown} are not tiers of the routing config "
+                         f"{list(snapshot.tiers)}")
+    unpriced = sorted({model for model in snapshot.models if model not in estimator.pricing})
+
+    def cost(prompt, i):
+        return 0.0 if unpriced else estimator.estimate_cost([prompt], snapshot.models[i])[0]
+
+    totals = {'routed': 0.0, 'labeled': 0.0, 'premium': 0.0}
+    routed_as: Dict[str, int] = {}
+    exact = under = over = 0
+    for prompt, label in corpus:
+        i = min(bisect_left(snapshot.bounds, router.score(prompt)), len(snapshot.bounds) - 1)
+        routed_as[snapshot.tiers[i]] = routed_as.get(snapshot.tiers[i], 0) + 1
+        totals['routed'] += cost(prompt, i)
+        totals['labeled'] += cost(prompt, rank[label])
+        totals['premium'] += cost(prompt, len(snapshot.models) - 1)
+        delta = i - rank[label]
+        exact += delta == 0
+        under += delta < 0
+        over += delta > 0
+    n = len(corpus)
+    priced = not unpriced
+    return {
+        'prompts': n,
+        'routedAs': routed_as,
+        'accuracy': exact / n,
+        'underRouted': under / n,
+        'overRouted': over / n,
+        'unpricedModels': unpriced,
+        'costRouted': totals['routed'] if priced else None,
+        'costLabeled': totals['labeled'] if priced else None,
+        'costPremium': totals['premium'] if priced else None,
+        'savedVsPremium': 1 - totals['routed'] / totals['premium'] if priced else None,
+    }
+
+
+def benchmark(router: ComplexityRouter, prompts: List[str], rounds: int = 2000) -> float:
+    """Microseconds per routing decision"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for prompt in prompts:
+            router.route(prompt)
+    return (time.perf_counter() - start) / (rounds * len(prompts)) * 1e6
+
+
+def load_corpus(path: str) -> List[Tuple[str, str]]:
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row['prompt'], row['label']) for row in rows]
+
+
+def main():
+    print("\n🥷 Cost Katana Python SDK - Local Complexity Router\n")
+
+    if '--live' not in sys.argv:
+        corpora = [('Dev (tuning)', DEV_CORPUS), ('Held-out', HOLDOUT_CORPUS)]
+        if '--eval' in sys.argv:
+            corpora = [('Your corpus', load_corpus(sys.argv[sys.argv.index('--eval') + 1]))]
+        router = ComplexityRouter()
+        per_decision = benchmark(router, [p for _, corpus in corpora for p, _ in corpus])
+        print(f"⏱️  {per_decision:.1f}µs per routing decision "
+              f"({1e6 / per_decision:,.0f} decisions/sec)")
+
+        for name, corpus in corpora:
+            try:
+                report = evaluate(router, corpus)
+            except ValueError as e:
+                print(f"\n❌ {name}: {e}")
+                continue
+            print(f"\n📊 {name}: {report['prompts']} labeled prompts, routed as {report['routedAs']}")
+            print(f"   Matches label:  {report['accuracy']:.0%}")
+            print(f"   Under-routed:   {report['underRouted']:.0%}  (quality risk)")
+            print(f"   Over-routed:    {report['overRouted']:.0%}  (extra spend)")
+            if report['unpricedModels']:
+                print(f"   ⚠️  No pricing for {report['unpricedModels']}; cost comparison skipped")
+                continue
+            print("   💰 Estimated cost (300 output tokens each): "
+                  f"premium ${report['costPremium']:.4f}, labels ${report['costLabeled']:.4f}, "
+                  f"router ${report['costRouted']:.4f} "
+                  f"({report['savedVsPremium']:.0%} saved vs premium)")
+        print("\n✅ Routed locally, no network call per decision!\n")
+        return
+
+    if not API_KEY:
+        print("❌ COST_KATANA_API_KEY required")
+        return
+
+    import cost_katana as ck
+
+    config = CachedRoutingConfig(refresh_interval=60).start()
+    if config.last_error:
+        print(f"⚠️  Using local tiers: {config.last_error}")
+    router = ComplexityRouter(config)
+    try:
+        for prompt, label in HOLDOUT_CORPUS[::5]:
+            route = router.route(prompt)
+            response = ck.ai(route.model, prompt)
+            print(f"{route.tier:<9} (score {route.score:.2f}, label {label:<8}) "
+                  f"${response.cost:.6f}  {prompt[:50]!r}")
+    finally:
+        config.stop()
+    print()
+
+if __name__ == '__main__':
+    main()